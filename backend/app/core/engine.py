@@ -6,24 +6,36 @@ playwright_config.env_vars, parses JSON output, and persists results.
 
 from __future__ import annotations
 
+import ast
 import asyncio
+import base64
+import codecs
+import contextlib
 import hashlib
 import json
 import logging
 import os
 import re
 import shutil
+import signal
 import sys
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Container, Mapping
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
-from uuid import uuid4
+from urllib.parse import urlparse
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.core.error_categorizer import categorize_error
+from app.core.security.encryption import decrypt_value
 from app.db.session import async_session_factory
 from app.models.project import Project, ProjectConfig
 from app.models.test_run import TestResult, TestRun, TestResultStatus, TestRunStatus
@@ -33,6 +45,21 @@ try:
 except Exception:
     ws_manager = None  # type: ignore[assignment]
 
+# orjson parses large test reports several times faster than stdlib json and
+# accepts bytes directly; its JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    _json_loads = json.loads
+
+# fcntl is POSIX-only; pipe resizing (F_SETPIPE_SZ) is further Linux-only.
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 # ── Docker host-gateway URL fixup ─────────────────────────────────────────────
@@ -44,14 +71,18 @@ _IS_DOCKER = Path("/.dockerenv").exists()
 _LOCALHOST_RE = re.compile(r"(https?://)(localhost|127\.0\.0\.1)(:\d+)")
 
 
-def _fix_host_url(url: str) -> str:
-    """Replace localhost/127.0.0.1 with host.docker.internal when in Docker.
-
-    No-op outside Docker or for non-HTTP(S) values.
-    """
-    if not _IS_DOCKER or not url.startswith(("http://", "https://")):
+# Specialized once at import: outside Docker this is an identity function,
+# so the .env loop pays no per-value check.
+if _IS_DOCKER:
+    def _fix_host_url(url: str) -> str:
+        """Replace localhost/127.0.0.1 with host.docker.internal (HTTP(S) values only)."""
+        if not url.startswith(("http://", "https://")):
+            return url
+        return _LOCALHOST_RE.sub(r"\1host.docker.internal\3", url)
+else:
+    def _fix_host_url(url: str) -> str:
+        """No-op outside Docker."""
         return url
-    return _LOCALHOST_RE.sub(r"\1host.docker.internal\3", url)
 
 
 # ── Per-project virtualenv ────────────────────────────────────────────────────
@@ -62,9 +93,12 @@ def _fix_host_url(url: str) -> str:
 # cwd does not mis-resolve relative executables.
 
 # ── Process registry ──────────────────────────────────────────────────────────
-# Maps run_id → subprocess.Process for cancellation and concurrency control
+# Maps run_id → subprocess.Process for cancellation
 _running_processes: dict[str, asyncio.subprocess.Process] = {}
 MAX_CONCURRENT_RUNS = 5
+# One slot per in-flight run, taken before any setup work so a saturated
+# engine rejects a run up front instead of after installing and writing files.
+_run_slots = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
 
 
 async def _broadcast_run(run_id: str, data: dict[str, Any]) -> None:
@@ -76,55 +110,242 @@ async def _broadcast_run(run_id: str, data: dict[str, Any]) -> None:
             pass
 
 
+# Lines of test output retained when only a tail (error snippet, fallback) is read.
+_OUTPUT_TAIL_LINES = 2000
+
+# Upper bound on lines per batched log broadcast, so one frame never balloons.
+_LOG_BATCH_MAX = 256
+
+
+async def _broadcast_drainer(run_id: str, queue: asyncio.Queue[str | None]) -> None:
+    """Broadcast queued log lines as ``{"logs": [...]}`` batches until ``None`` arrives.
+
+    Each wake-up takes everything already queued (up to ``_LOG_BATCH_MAX``), so a
+    chatty test process produces a handful of WebSocket frames instead of one
+    per output line.
+    """
+    while True:
+        line = await queue.get()
+        if line is None:
+            return
+        batch = [line]
+        done = False
+        while len(batch) < _LOG_BATCH_MAX:
+            try:
+                line = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if line is None:
+                done = True
+                break
+            batch.append(line)
+        await _broadcast_run(run_id, {"logs": batch})
+        if done:
+            return
+
+
+async def _read_lines(stream: asyncio.StreamReader) -> AsyncIterator[str]:
+    """Yield *stream*'s lines (right-stripped), reading it in 64 KiB chunks.
+
+    One read() typically carries dozens of lines, so the reader wakes once per
+    chunk rather than once per line.  A single incremental decoder per stream
+    decodes each chunk once and holds back multi-byte characters split across
+    reads; only the partial last line is carried over as text.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while True:
+        chunk = await stream.read(65536)
+        if chunk:
+            text = pending + decoder.decode(chunk)
+            cut = text.rfind("\n")
+            if cut < 0:
+                pending = text
+                continue
+            pending = text[cut + 1:]
+            text = text[:cut]
+        else:
+            text, pending = pending + decoder.decode(b"", final=True), ""
+            if not text:
+                return
+        for line in text.split("\n"):
+            yield line.rstrip()
+
+
+async def _stream_to_logs(
+    stream: asyncio.StreamReader, buf: deque[str], log_q: asyncio.Queue[str | None],
+) -> None:
+    """Collect *stream*'s lines into *buf* and queue them for the Test Logs drainer."""
+    async for line in _read_lines(stream):
+        buf.append(line)
+        if line.strip():
+            log_q.put_nowait(f"[test] {line}")
+
+
+# Linux's F_SETPIPE_SZ (missing from the fcntl module before Python 3.10).
+_F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+_PIPE_SIZE = 1 << 20
+
+
+def _widen_output_pipes(proc: asyncio.subprocess.Process) -> None:
+    """Grow *proc*'s stdout/stderr pipes from 64 KiB to 1 MiB where supported.
+
+    A larger kernel buffer lets each 64 KiB read in :func:`_read_lines` come
+    back full, so a chatty test run costs fewer wake-ups.  Best effort: other
+    platforms, or a limit below 1 MiB in /proc/sys/fs/pipe-max-size, keep the default.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return
+    for fd in (1, 2):
+        try:
+            pipe = proc._transport.get_pipe_transport(fd).get_extra_info("pipe")  # type: ignore[attr-defined]
+            fcntl.fcntl(pipe.fileno(), _F_SETPIPE_SZ, _PIPE_SIZE)
+        except (AttributeError, OSError):
+            pass
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """SIGKILL *proc* and everything in its session (started with start_new_session=True).
+
+    Installers and test runners spawn helper processes (pip build backends,
+    uv workers, xdist workers, browsers) that a plain ``proc.kill()`` would
+    orphan.  Falls back to killing only the lead process where process groups
+    are unavailable.
+    """
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+async def _terminate_process_group(proc: asyncio.subprocess.Process, grace: float = 2.0) -> None:
+    """SIGTERM *proc*'s session, then SIGKILL whatever is left after *grace* seconds.
+
+    SIGTERM gives pytest/Playwright the chance to stop their workers and
+    browsers; the SIGKILL sweep catches the ones that didn't.  Reaps *proc*.
+    """
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        try:
+            proc.terminate()
+        except ProcessLookupError:
+            pass
+    try:
+        async with asyncio.timeout(grace):
+            await proc.wait()
+    except TimeoutError:
+        pass
+    _kill_process_group(proc)
+    await proc.wait()
+
+
 async def _stream_install_cmd(
     cmd: list[str],
     run_id: str | None,
     label: str,
     timeout: float = 300.0,
+    stdin_data: bytes | None = None,
 ) -> tuple[bool, str]:
-    """Run an install command, streaming each output line as a WebSocket log message.
+    """Run an install command, streaming its output lines as batched WebSocket log messages.
 
-    Returns (success, combined_stderr_text).
+    When *stdin_data* is given it is piped to the command's stdin (used to feed
+    a requirements payload via ``-r /dev/stdin`` instead of one argv entry per spec).
+
+    Returns (success, stderr_tail_text).  Only the last few lines of each
+    stream are retained, so memory stays flat however verbose the install is.
     """
     if run_id:
         await _broadcast_run(run_id, {"log": f"[install] {label}"})
     logger.info("engine: %s", label)
 
+    # pip is a Python program: an inherited PYTHONUNBUFFERED (common in container
+    # images) would make it write one syscall per line.  Nothing here needs
+    # line-level latency, so let it block-buffer.
+    env = os.environ.copy()
+    env.pop("PYTHONUNBUFFERED", None)
+
     proc = await asyncio.create_subprocess_exec(
         *cmd,
+        stdin=asyncio.subprocess.PIPE if stdin_data is not None else None,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
+        env=env,
+        # Larger reader buffer: fewer pause/resume cycles on the pipe transport
+        # while _read_lines pulls 64 KiB chunks.
+        limit=_PIPE_SIZE,
+        # Our fds are non-inheritable (PEP 446), so skip the close-all-fds sweep
+        # on spawn; a new session lets a timeout kill the whole install tree.
+        close_fds=False,
+        start_new_session=True,
     )
 
-    stdout_lines: list[str] = []
-    stderr_lines: list[str] = []
+    async def _feed(stream: asyncio.StreamWriter, data: bytes) -> None:
+        try:
+            stream.write(data)
+            await stream.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # child exited before reading everything — its exit code tells the story
+        finally:
+            stream.close()
 
-    async def _drain(stream: asyncio.StreamReader, buf: list[str]) -> None:
-        async for raw in stream:
-            line = raw.decode("utf-8", errors="replace").rstrip()
+    # Bounded tails: the failure message only shows the last 5 lines and the
+    # returned stderr text is only ever logged truncated.
+    stdout_lines: deque[str] = deque(maxlen=5)
+    stderr_lines: deque[str] = deque(maxlen=32)
+
+    # Output lines go through the same coalescing drainer as test logs, so a
+    # verbose pip/uv install sends a few batched frames rather than one per line.
+    log_q: asyncio.Queue[str | None] | None = None
+    drainer: asyncio.Task[None] | None = None
+    if run_id:
+        log_q = asyncio.Queue()
+        drainer = asyncio.create_task(_broadcast_drainer(run_id, log_q))
+
+    async def _drain(stream: asyncio.StreamReader, buf: deque[str]) -> None:
+        async for line in _read_lines(stream):
             if line:
                 buf.append(line)
-                if run_id:
-                    await _broadcast_run(run_id, {"log": f"  {line}"})
+                if log_q is not None:
+                    log_q.put_nowait(f"  {line}")
 
     t_out = asyncio.create_task(_drain(proc.stdout, stdout_lines))  # type: ignore[arg-type]
     t_err = asyncio.create_task(_drain(proc.stderr, stderr_lines))  # type: ignore[arg-type]
+    tasks = [t_out, t_err]
+    if stdin_data is not None:
+        tasks.append(asyncio.create_task(_feed(proc.stdin, stdin_data)))  # type: ignore[arg-type]
+    timed_out = False
     try:
-        await asyncio.wait_for(asyncio.gather(t_out, t_err), timeout=timeout)
-    except asyncio.TimeoutError:
-        t_out.cancel()
-        t_err.cancel()
-        proc.kill()
+        async with asyncio.timeout(timeout):
+            await asyncio.gather(*tasks)
+    except TimeoutError:
+        for t in tasks:
+            t.cancel()
+        _kill_process_group(proc)
+        await proc.wait()  # reap the child so its transport is closed on this loop
+        timed_out = True
+    finally:
+        # Flush queued output so status messages below land after it
+        if drainer is not None:
+            log_q.put_nowait(None)  # type: ignore[union-attr]
+            await drainer
+
+    if timed_out:
         if run_id:
             await _broadcast_run(run_id, {"log": "[install] ⚠ Timed out after 5 minutes"})
         return False, "Timed out"
 
-    await proc.wait()
-    returncode = proc.returncode or 0
+    # Both pipes are at EOF, so the exit status has usually been collected already.
+    returncode = proc.returncode
+    if returncode is None:
+        returncode = await proc.wait()
     success = returncode == 0
 
     if not success:
-        err_tail = "\n".join((stdout_lines + stderr_lines)[-5:])
+        err_tail = "\n".join([*stdout_lines, *stderr_lines][-5:])
         if run_id:
             await _broadcast_run(run_id, {"log": f"[install] ⚠ Exited {returncode}: {err_tail[:300]}"})
         logger.warning("engine: install exited %s: %s", returncode, "\n".join(stderr_lines)[:300])
@@ -139,7 +360,7 @@ def cancel_run(run_id: str) -> bool:
     """Kill the subprocess for a given run_id. Returns True if process was found and killed."""
     proc = _running_processes.get(run_id)
     if proc and proc.returncode is None:
-        proc.kill()
+        _kill_process_group(proc)
         logger.info("engine: killed subprocess for run %s", run_id)
         return True
     return False
@@ -155,14 +376,16 @@ def _get_effective_path(project_id: str, project_path: str) -> str:
     workspace/{project_id}/, use that directory directly.  This avoids the
     need for the backend container to have access to the host filesystem.
     """
-    ws = Path("workspace") / project_id
-    if ws.exists() and ws.is_dir():
-        try:
-            if any(ws.iterdir()):
-                logger.info("engine: using synced workspace for project %s", project_id)
-                return str(ws)
-        except OSError:
-            pass
+    ws = os.path.join("workspace", project_id)
+    try:
+        # One opendir/readdir answers "exists, is a directory, not empty".
+        with os.scandir(ws) as it:
+            has_entries = next(it, None) is not None
+    except OSError:
+        has_entries = False
+    if has_entries:
+        logger.info("engine: using synced workspace for project %s", project_id)
+        return ws
     return _translate_path(project_path)
 
 
@@ -172,13 +395,37 @@ def _get_effective_path(project_id: str, project_path: str) -> str:
 _ESSENTIALS_VERSION = "v2"
 
 
+# path → (mtime_ns, ctime_ns, size, content digest) of requirements files.
+# ctime moves on every write and cannot be reset by utime(), so an unchanged
+# stat means unchanged contents and the file need not be read again.
+_REQ_FILE_DIGESTS: dict[Path, tuple[int, int, int, bytes]] = {}
+
+
+def _req_file_digest(path: Path, st: os.stat_result) -> bytes:
+    """Content digest of *path*, reusing the last one while its stat is unchanged."""
+    hit = _REQ_FILE_DIGESTS.get(path)
+    if hit is not None and hit[:3] == (st.st_mtime_ns, st.st_ctime_ns, st.st_size):
+        return hit[3]
+    try:
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+    except OSError:
+        return b""
+    _REQ_FILE_DIGESTS[path] = (st.st_mtime_ns, st.st_ctime_ns, st.st_size, digest)
+    return digest
+
+
 def _req_hash(workspace_path: Path) -> str:
-    """MD5 fingerprint of all requirements files found in *workspace_path*.
+    """Fingerprint of all requirements files found in *workspace_path*.
+
+    Each file contributes its relative path plus a digest of its contents,
+    so workspace syncs that rewrite unchanged files (``extractall`` and
+    ``write_bytes`` stamp fresh mtimes) do not force a reinstall.  A file is
+    only re-read when its stat changed since it was last hashed.
 
     Also incorporates the essentials version so adding/removing packages
     from the essentials list forces all per-project venvs to rebuild.
     """
-    h = hashlib.md5()
+    h = hashlib.blake2b(digest_size=16)
     h.update(f"essentials:{_ESSENTIALS_VERSION}".encode())
     for fname in (
         "requirements.txt",
@@ -190,15 +437,32 @@ def _req_hash(workspace_path: Path) -> str:
     ):
         for search_dir in [workspace_path, workspace_path / "backend", workspace_path / "api"]:
             f = search_dir / fname
-            if f.exists():
-                try:
-                    h.update(str(f.relative_to(workspace_path)).encode())
-                    h.update(f.read_bytes())
-                except OSError:
-                    pass
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            h.update(str(f.relative_to(workspace_path)).encode())
+            h.update(_req_file_digest(f, st))
     return h.hexdigest()
 
 
+# workspace → (monotonic time, _req_hash digest).  A burst of runs on one
+# project (up to MAX_CONCURRENT_RUNS at once) fingerprints it only once.
+_REQ_HASH_CACHE: dict[Path, tuple[float, str]] = {}
+_REQ_HASH_TTL = 2.0
+
+
+def _req_hash_cached(workspace_path: Path) -> str:
+    """:func:`_req_hash`, reused for ``_REQ_HASH_TTL`` seconds per workspace."""
+    now = time.monotonic()
+    hit = _REQ_HASH_CACHE.get(workspace_path)
+    if hit is not None and now - hit[0] < _REQ_HASH_TTL:
+        return hit[1]
+    digest = _req_hash(workspace_path)
+    _REQ_HASH_CACHE[workspace_path] = (now, digest)
+    return digest
+
+
 # Import names that map to a different PyPI package name
 _IMPORT_TO_PKG: dict[str, str] = {
     "dotenv": "python-dotenv",
@@ -230,6 +494,60 @@ _STDLIB_NAMES: frozenset[str] = frozenset({
 })
 
 _SKIP_VENV_DIRS: frozenset[str] = frozenset({".testforge_venv", "node_modules", ".git", "__pycache__"})
+_SKIP_SCAN_DIRS: frozenset[str] = _SKIP_VENV_DIRS | {"dist", "build"}
+
+
+def _find_playwright_config(base: Path, max_depth: int = 4) -> Path | None:
+    """Return the shallowest ``playwright.config.{ts,js,mjs}`` under *base*, or None.
+
+    Breadth-first ``os.scandir`` walk that never descends into dependency,
+    VCS or build directories, and stops at *max_depth* path components
+    (``a/b/c/playwright.config.ts`` is depth 4).
+    """
+    queue: deque[tuple[str, int]] = deque([(str(base), 1)])
+    while queue:
+        directory, depth = queue.popleft()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("playwright.config."):
+                        if name.endswith((".ts", ".js", ".mjs")) and entry.is_file():
+                            return Path(entry.path)
+                    elif (
+                        depth < max_depth
+                        and name not in _SKIP_SCAN_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    ):
+                        queue.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    return None
+
+
+# Normalized package names that are too large/slow to install in a test venv.
+# These require GPU drivers, system libs, or take >5 min to download.
+_HEAVY_PACKAGES: frozenset[str] = frozenset({
+    "torch", "torchvision", "torchaudio", "torchtext", "torch_geometric",
+    "tensorflow", "tensorflow_cpu", "tensorflow_gpu", "tf_keras",
+    "keras", "jax", "flax", "trax",
+    "scikit_learn", "scipy", "statsmodels",
+    "opencv_python", "opencv_python_headless", "opencv_contrib_python",
+    "matplotlib", "seaborn", "plotly", "bokeh", "altair",
+    "transformers", "diffusers", "accelerate", "peft", "trl", "bitsandbytes",
+    "xgboost", "lightgbm", "catboost",
+    "spacy", "nltk", "gensim", "flair",
+    "librosa", "soundfile", "audioread", "pyaudio", "pydub", "noisereduce",
+    "numba", "cupy", "cupy_cuda", "triton",
+    "sentence_transformers", "faiss_cpu", "faiss_gpu", "chromadb",
+    "llama_cpp_python", "ctransformers",
+    "paddle", "paddlepaddle",
+    "mmcv", "mmdet", "mmsegmentation",
+    "detectron2",
+})
+
+_REQ_NAME_RE = re.compile(r"^([A-Za-z0-9_\-\.]+)")
+_REQ_NAME_NORM = str.maketrans("-.", "__")
 
 
 def _collect_test_dependencies(workspace_abs: Path) -> list[str]:
@@ -240,30 +558,11 @@ def _collect_test_dependencies(workspace_abs: Path) -> list[str]:
     This is a 'full minus heavy' strategy: install everything from requirements.txt
     except the packages that are too large or require GPU/system libs.
     """
-    # Normalized package names that are too large/slow to install in a test venv.
-    # These require GPU drivers, system libs, or take >5 min to download.
-    _HEAVY: frozenset[str] = frozenset({
-        "torch", "torchvision", "torchaudio", "torchtext", "torch_geometric",
-        "tensorflow", "tensorflow_cpu", "tensorflow_gpu", "tf_keras",
-        "keras", "jax", "flax", "trax",
-        "scikit_learn", "scipy", "statsmodels",
-        "opencv_python", "opencv_python_headless", "opencv_contrib_python",
-        "matplotlib", "seaborn", "plotly", "bokeh", "altair",
-        "transformers", "diffusers", "accelerate", "peft", "trl", "bitsandbytes",
-        "xgboost", "lightgbm", "catboost",
-        "spacy", "nltk", "gensim", "flair",
-        "librosa", "soundfile", "audioread", "pyaudio", "pydub", "noisereduce",
-        "numba", "cupy", "cupy_cuda", "triton",
-        "sentence_transformers", "faiss_cpu", "faiss_gpu", "chromadb",
-        "llama_cpp_python", "ctransformers",
-        "paddle", "paddlepaddle",
-        "mmcv", "mmdet", "mmsegmentation",
-        "detectron2",
-    })
-
-    req_name_re = re.compile(r"^([A-Za-z0-9_\-\.]+)")
     result: list[str] = []
     seen: set[str] = set()
+    excluded: set[str] = set()
+    match_name = _REQ_NAME_RE.match
+    is_heavy = _HEAVY_PACKAGES.__contains__
 
     for fname in ("requirements.txt", "requirements-test.txt", "requirements-dev.txt"):
         for search_dir in [workspace_abs, workspace_abs / "backend", workspace_abs / "api"]:
@@ -273,23 +572,26 @@ def _collect_test_dependencies(workspace_abs: Path) -> list[str]:
             try:
                 for line in req_f.read_text(encoding="utf-8").splitlines():
                     line = line.strip()
-                    if not line or line.startswith(("#", "-r ", "-c ", "git+", "http", "--")):
+                    if not line or line.startswith(("#", "-r ", "-c ", "git+", "http://", "https://", "--")):
                         continue
-                    m = req_name_re.match(line)
+                    m = match_name(line)
                     if not m:
                         continue
-                    norm = m.group(1).lower().replace("-", "_").replace(".", "_")
-                    if norm in seen or norm in _HEAVY:
+                    norm = m.group(1).lower().translate(_REQ_NAME_NORM)
+                    if norm in seen:
+                        continue
+                    if is_heavy(norm):
+                        excluded.add(norm)
                         continue
                     seen.add(norm)
-                    result.append(line.split("#")[0].strip())  # strip inline comments
+                    result.append(line.split("#", 1)[0].strip())  # strip inline comments
             except OSError:
                 pass
 
     logger.info(
         "engine: collected %d requirement specs (excluded %d heavy packages)",
         len(result),
-        len([n for n in seen if n in _HEAVY]),
+        len(excluded),
     )
     return result
 
@@ -318,7 +620,7 @@ async def _ensure_project_venv(
     pip_bin = venv_dir / "bin" / "pip"
     hash_file = venv_dir / ".req_hash"
 
-    current_hash = _req_hash(workspace_abs)
+    current_hash = await asyncio.to_thread(_req_hash_cached, workspace_abs)
 
     # Skip if venv is up to date
     if python_bin.exists() and hash_file.exists():
@@ -331,6 +633,10 @@ async def _ensure_project_venv(
         except OSError:
             pass
 
+    # Scan the requirements files for Phase 2 in a worker thread while the
+    # venv is created and Phase 1 installs.
+    deps_task = asyncio.create_task(asyncio.to_thread(_collect_test_dependencies, workspace_abs))
+
     # Create the virtualenv
     if run_id:
         await _broadcast_run(run_id, {"log": "[env] Creating isolated Python environment…"})
@@ -342,6 +648,7 @@ async def _ensure_project_venv(
         timeout=120.0,
     )
     if not venv_ok:
+        deps_task.cancel()
         return None
 
     install_ok = True
@@ -356,8 +663,14 @@ async def _ensure_project_venv(
         "pytest-playwright",  # E2E tests via Python Playwright (page fixture + screenshots)
         "uv",  # install uv so Phase 2 can use it (10-100x faster than pip)
     ]
+    # Rebuilding an existing venv (requirements changed): uv is already there
+    # from an earlier Phase 1, so skip pip's slow start-up and resolver.
+    if uv_bin.exists():
+        phase1_cmd = [str(uv_bin), "pip", "install", "--python", str(python_bin), *essentials]
+    else:
+        phase1_cmd = [str(pip_bin), "install", *essentials]
     phase1_ok, _ = await _stream_install_cmd(
-        [str(pip_bin), "install"] + essentials,
+        phase1_cmd,
         run_id,
         f"Phase 1 — test essentials: {', '.join(essentials[:4])}…",
         timeout=300.0,
@@ -367,21 +680,25 @@ async def _ensure_project_venv(
 
     # Phase 2: project requirements minus known-heavy packages.
     # If uv is available after Phase 1, use it for dramatic speed improvement.
-    test_deps = _collect_test_dependencies(workspace_abs)
+    # The specs are fed as one requirements payload on stdin rather than one
+    # argv entry each, so large requirement sets can't hit ARG_MAX.
+    test_deps = await deps_task
     if test_deps:
         if uv_bin.exists():
             phase2_cmd = [
                 str(uv_bin), "pip", "install",
                 "--python", str(python_bin),
-            ] + test_deps
+                "-r", "/dev/stdin",
+            ]
         else:
-            phase2_cmd = [str(pip_bin), "install"] + test_deps
+            phase2_cmd = [str(pip_bin), "install", "-r", "/dev/stdin"]
 
         phase2_ok, _ = await _stream_install_cmd(
             phase2_cmd,
             run_id,
             f"Phase 2 — {len(test_deps)} project deps via {'uv' if uv_bin.exists() else 'pip'}",
             timeout=300.0,
+            stdin_data=("\n".join(test_deps) + "\n").encode(),
         )
         if not phase2_ok:
             install_ok = False
@@ -395,6 +712,7 @@ async def _ensure_project_venv(
             hash_file.write_text(current_hash)
         except OSError:
             pass
+        _REQ_HASH_CACHE.pop(workspace_abs, None)
     else:
         logger.warning(
             "engine: dep install incomplete for %s — hash NOT stamped, will retry next run",
@@ -428,11 +746,12 @@ def _translate_path(project_path: str) -> str:
     if host_prefix and project_path.startswith(host_prefix):
         return container_prefix + project_path[len(host_prefix):]
 
-    # Mode 2 — auto-detect: path is a host path not visible in the container
-    local = Path(project_path)
-    if not local.exists():
-        candidate = Path(container_prefix) / local.name
-        if candidate.exists() and candidate.is_dir():
+    # Mode 2 — auto-detect: path is a host path not visible in the container.
+    # os.path.exists/isdir treat any stat error (e.g. an unreachable network
+    # mount) as "not there" instead of raising like Path.exists() can.
+    if not os.path.exists(project_path):
+        candidate = Path(container_prefix) / Path(project_path).name
+        if os.path.isdir(candidate):
             logger.debug(
                 "engine: auto-translated %s → %s via container prefix",
                 project_path,
@@ -443,6 +762,23 @@ def _translate_path(project_path: str) -> str:
     return project_path
 
 
+# Report sections _parse_pytest_output never reads.  Omitting them at the
+# source keeps multi-MB reports small (collectors alone lists every node), so
+# there is less to write, read and parse.  ``streams`` must stay: the
+# screenshot/network sentinels live in each test's call.stdout.
+_PYTEST_REPORT_OMIT: tuple[str, ...] = (
+    "--json-report-omit", "collectors", "keywords", "log", "traceback", "warnings",
+)
+
+
+# Directories (relative to the project root) probed for runner config files.
+_PLAYWRIGHT_SUBDIRS = (
+    "e2e", "tests", "tests/e2e", "playwright", "e2e/tests", "frontend", "app", "apps/web", "packages/e2e",
+)
+_PLAYWRIGHT_NESTED = ("e2e", "tests", "playwright")
+_PYTEST_SUBDIRS = ("backend", "api", "server", "src", "app", "lib", "tests")
+
+
 def _detect_runner(
     project_path: str,
     *,
@@ -489,21 +825,21 @@ def _detect_runner(
     # Playwright (TypeScript / JavaScript) — root and common subdirs (including monorepo layouts)
     playwright_configs = ("playwright.config.ts", "playwright.config.js", "playwright.config.mjs")
     search_dirs: list[Path] = [base]
-    for sub in ("e2e", "tests", "tests/e2e", "playwright", "e2e/tests", "frontend", "app", "apps/web", "packages/e2e"):
+    for sub in _PLAYWRIGHT_SUBDIRS:
         d = base / sub
         if d.is_dir():
             search_dirs.append(d)
     # One more level: e.g. apps/web/e2e, packages/e2e/tests
     for sub in list(search_dirs):
         if sub != base:
-            for sub2 in ("e2e", "tests", "playwright"):
+            for sub2 in _PLAYWRIGHT_NESTED:
                 d2 = sub / sub2
                 if d2.is_dir():
                     search_dirs.append(d2)
     # Only use Playwright if npx is actually available in the container.
     # If running in a Python-only Docker image, npx won't be installed and
     # trying to exec it causes [Errno 2] No such file or directory.
-    npx = shutil.which("npx")
+    npx = _which("npx")
     if npx:
         for root in search_dirs:
             for cfg in playwright_configs:
@@ -523,33 +859,25 @@ def _detect_runner(
                     if browser and browser in ("chromium", "firefox", "webkit"):
                         cmd += [f"--project={browser}"]
                     return "frontend", cmd, str(root)
-        # Glob for playwright.config.* anywhere under base (max depth 4 for monorepos)
-        try:
-            for path in base.rglob("playwright.config.*"):
-                if path.suffix in (".ts", ".js", ".mjs") and path.is_file():
-                    try:
-                        if len(path.relative_to(base).parts) > 4:
-                            continue
-                    except ValueError:
-                        continue
-                    root = path.parent
-                    cmd = [
-                        npx, "playwright", "test",
-                        "--reporter=json",
-                        "--screenshot=only-on-failure",
-                        "--output=/app/screenshots/pw-results",
-                    ]
-                    if parallel_workers > 1:
-                        cmd += [f"--workers={parallel_workers}"]
-                    if retry_count > 0:
-                        cmd += [f"--retries={retry_count}"]
-                    if test_timeout != 30000:
-                        cmd += [f"--timeout={test_timeout}"]
-                    if browser and browser in ("chromium", "firefox", "webkit"):
-                        cmd += [f"--project={browser}"]
-                    return "frontend", cmd, str(root)
-        except OSError:
-            pass
+        # Look for playwright.config.* anywhere under base (max depth 4 for monorepos)
+        path = _find_playwright_config(base)
+        if path is not None:
+            root = path.parent
+            cmd = [
+                npx, "playwright", "test",
+                "--reporter=json",
+                "--screenshot=only-on-failure",
+                "--output=/app/screenshots/pw-results",
+            ]
+            if parallel_workers > 1:
+                cmd += [f"--workers={parallel_workers}"]
+            if retry_count > 0:
+                cmd += [f"--retries={retry_count}"]
+            if test_timeout != 30000:
+                cmd += [f"--timeout={test_timeout}"]
+            if browser and browser in ("chromium", "firefox", "webkit"):
+                cmd += [f"--project={browser}"]
+            return "frontend", cmd, str(root)
     else:
         logger.info(
             "engine: npx not found in PATH — skipping Playwright detection "
@@ -564,7 +892,7 @@ def _detect_runner(
         "conftest.py", "requirements.txt",
     )
     _pytest_search: list[Path] = [base]
-    for _sub in ("backend", "api", "server", "src", "app", "lib", "tests"):
+    for _sub in _PYTEST_SUBDIRS:
         _d = base / _sub
         if _d.is_dir():
             _pytest_search.append(_d)
@@ -581,20 +909,21 @@ def _detect_runner(
                         pytest_bin = str(venv_pytest)
                     else:
                         # venv exists but pytest not yet installed — fall back
-                        pytest_bin = shutil.which("pytest") or sys.executable + " -m pytest"
+                        pytest_bin = _which("pytest") or sys.executable + " -m pytest"
                 else:
-                    pytest_bin = shutil.which("pytest") or sys.executable + " -m pytest"
+                    pytest_bin = _which("pytest") or sys.executable + " -m pytest"
                 # Write JSON report to a file so stdout/stderr are free for live streaming.
                 # The file is read after the subprocess exits and then removed.
                 _json_report_arg = "--json-report-file=.testforge_report.json"
+                # _PYTEST_REPORT_OMIT drops report sections the parser never reads.
                 # If pytest_bin contains a space (the "-m pytest" fallback), split it
                 # -p no:base_url — disable pytest-base-url plugin (bundled with
                 # pytest-playwright) to prevent ScopeMismatch when the project
                 # defines its own `base_url` fixture with function scope.
                 if " " in pytest_bin:
-                    cmd = pytest_bin.split() + ["--json-report", _json_report_arg, "-v", "-p", "no:base_url"]
+                    cmd = pytest_bin.split() + ["--json-report", _json_report_arg, *_PYTEST_REPORT_OMIT, "-v", "-p", "no:base_url"]
                 else:
-                    cmd = [pytest_bin, "--json-report", _json_report_arg, "-v", "-p", "no:base_url"]
+                    cmd = [pytest_bin, "--json-report", _json_report_arg, *_PYTEST_REPORT_OMIT, "-v", "-p", "no:base_url"]
                 if parallel_workers > 1:
                     cmd += ["-n", str(parallel_workers)]
                 if retry_count > 0:
@@ -609,12 +938,12 @@ def _detect_runner(
                 return "backend", cmd, str(_pytest_dir)
 
     # package.json test script — only if npm is available
-    npm = shutil.which("npm")
+    npm = _which("npm")
     if npm:
         pkg = base / "package.json"
         if pkg.exists():
             try:
-                data = json.loads(pkg.read_text())
+                data = _json_loads(pkg.read_bytes())
                 scripts = data.get("scripts", {})
                 if "test" in scripts:
                     return "frontend", [npm, "run", "test", "--", "--reporter=json"], str(base)
@@ -635,6 +964,30 @@ def _detect_runner(
     )
 
 
+# Report status → result status, built once rather than per test.
+_PLAYWRIGHT_STATUS: dict[str, TestResultStatus] = {
+    "passed": TestResultStatus.PASSED,
+    "failed": TestResultStatus.FAILED,
+    "skipped": TestResultStatus.SKIPPED,
+    "timedOut": TestResultStatus.ERROR,
+}
+_GO_TEST_STATUS: dict[str, TestResultStatus] = {
+    "pass": TestResultStatus.PASSED,
+    "fail": TestResultStatus.FAILED,
+    "skip": TestResultStatus.SKIPPED,
+}
+_JEST_STATUS: dict[str, TestResultStatus] = {
+    "passed": TestResultStatus.PASSED,
+    "failed": TestResultStatus.FAILED,
+    "skipped": TestResultStatus.SKIPPED,
+    "pending": TestResultStatus.SKIPPED,
+    "todo": TestResultStatus.SKIPPED,
+}
+
+# Shared read-only stand-in for a missing "error" object.
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
 def _parse_playwright_output(raw: str) -> list[dict[str, Any]]:
     """Parse Playwright --reporter=json stdout into a list of result dicts.
 
@@ -643,14 +996,14 @@ def _parse_playwright_output(raw: str) -> list[dict[str, Any]]:
     """
     results: list[dict[str, Any]] = []
     try:
-        data = json.loads(raw)
+        data = _json_loads(raw)
     except json.JSONDecodeError:
         # Playwright may print progress lines before JSON; find the last { ... }
         start = raw.rfind("{")
         if start == -1:
             return results
         try:
-            data = json.loads(raw[start:])
+            data = _json_loads(raw[start:])
         except json.JSONDecodeError:
             return results
 
@@ -669,14 +1022,9 @@ def _parse_playwright_output(raw: str) -> list[dict[str, Any]]:
             for test in spec.get("tests", []):
                 for attempt in test.get("results", []):
                     status_raw = attempt.get("status", "passed")
-                    status = {
-                        "passed": TestResultStatus.PASSED,
-                        "failed": TestResultStatus.FAILED,
-                        "skipped": TestResultStatus.SKIPPED,
-                        "timedOut": TestResultStatus.ERROR,
-                    }.get(status_raw, TestResultStatus.ERROR)
+                    status = _PLAYWRIGHT_STATUS.get(status_raw, TestResultStatus.ERROR)
 
-                    error = attempt.get("error", {})
+                    error = attempt.get("error") or _EMPTY
 
                     # Extract screenshot from attachments
                     screenshot_path: str | None = None
@@ -700,8 +1048,8 @@ def _parse_playwright_output(raw: str) -> list[dict[str, Any]]:
                                 screenshot_path = att_path
                             break
 
-                    err_msg = error.get("message") if error else None
-                    err_stk = error.get("stack") if error else None
+                    err_msg = error.get("message")
+                    err_stk = error.get("stack")
                     results.append(
                         {
                             "test_name": spec_title,
@@ -729,73 +1077,97 @@ def _parse_playwright_output(raw: str) -> list[dict[str, Any]]:
     return results
 
 
-def _parse_pytest_output(raw: str) -> list[dict[str, Any]]:
-    """Parse pytest --json-report stdout into a list of result dicts.
+# Sentinel lines printed by the testforge conftest fixtures.  One C-level scan
+# finds both kinds; anchoring to line start ignores mentions mid-line.
+_SENTINEL_RE = re.compile(
+    r"^[ \t]*\[testforge:(screenshot|network)\][ \t]*(\S.*?)[ \t\r]*$", re.MULTILINE
+)
 
-    Stdout may contain pytest progress output before the JSON; find the last {...}.
+
+# pytest-json-report outcome → result status (built once, not per test)
+_PYTEST_STATUS: dict[str, TestResultStatus] = {
+    "passed": TestResultStatus.PASSED,
+    "failed": TestResultStatus.FAILED,
+    "skipped": TestResultStatus.SKIPPED,
+    "error": TestResultStatus.ERROR,
+}
+
+
+def _parse_pytest_output(raw: str | bytes) -> list[dict[str, Any]]:
+    """Parse pytest --json-report output into a list of result dicts.
+
+    *raw* is either the report file's bytes (parsed without a decode round-trip)
+    or captured stdout, which may contain progress output before the JSON;
+    in that case the last {...} is used.
     """
-    results: list[dict[str, Any]] = []
     data = None
     try:
-        data = json.loads(raw)
+        data = _json_loads(raw)
     except json.JSONDecodeError:
-        start = raw.rfind("{")
+        start = raw.rfind(b"{" if isinstance(raw, bytes) else "{")  # type: ignore[arg-type]
         if start != -1:
             try:
-                data = json.loads(raw[start:])
+                data = _json_loads(raw[start:])
             except json.JSONDecodeError:
                 pass
     if not data:
-        return results
+        return []
+    return _parse_pytest_report(data)
+
 
+def _parse_pytest_report(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Turn an already-decoded pytest-json-report document into result dicts."""
+    results: list[dict[str, Any]] = []
     for t in data.get("tests", []):
         nodeid: str = t.get("nodeid", "")
         # nodeid format: path/to/file.py::TestClass::test_name or path/to/file.py::test_name
-        parts = nodeid.split("::")
-        file_path = parts[0] if parts else ""
-        test_name = parts[-1] if len(parts) >= 2 else nodeid
-        suite = parts[1] if len(parts) >= 3 else None
+        # file::[Suite::]...::test — sliced in place, no per-test list
+        i = nodeid.find("::")
+        if i < 0:
+            file_path = test_name = nodeid
+            suite = None
+        else:
+            file_path = nodeid[:i]
+            test_name = nodeid[nodeid.rfind("::") + 2:]
+            k = nodeid.find("::", i + 2)
+            suite = nodeid[i + 2:k] if k >= 0 else None
 
         outcome = t.get("outcome", "passed")
-        status = {
-            "passed": TestResultStatus.PASSED,
-            "failed": TestResultStatus.FAILED,
-            "skipped": TestResultStatus.SKIPPED,
-            "error": TestResultStatus.ERROR,
-        }.get(outcome, TestResultStatus.ERROR)
+        status = _PYTEST_STATUS.get(outcome, TestResultStatus.ERROR)
 
         longrepr = t.get("longrepr") or ""
 
         # Tests inside tests/testforge/e2e/ are frontend (Playwright) tests
-        is_e2e = "/testforge/e2e/" in file_path or "\\testforge\\e2e\\" in file_path
+        # Docker paths are POSIX already; only Windows-style ids need the replace
+        fp_norm = file_path.replace("\\", "/") if "\\" in file_path else file_path
+        is_e2e = "/testforge/e2e/" in fp_norm
         layer = "frontend" if is_e2e else "backend"
 
         # Look for sentinels printed by the testforge conftest fixture:
         # "[testforge:screenshot]/app/screenshots/tf_test_name.png"
         # "[testforge:network]/app/network_captures/tf_test_name.json"
         screenshot_path: str | None = None
+        net_path: str | None = None
         network_requests: list[dict[str, Any]] | None = None
-        call_stdout = (t.get("call") or {}).get("stdout") or ""
-        for line in call_stdout.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("[testforge:screenshot]"):
-                candidate = stripped[len("[testforge:screenshot]"):].strip()
-                if candidate:
-                    screenshot_path = candidate
-            elif stripped.startswith("[testforge:network]"):
-                net_path = stripped[len("[testforge:network]"):].strip()
-                if net_path:
-                    try:
-                        network_requests = json.loads(Path(net_path).read_text(encoding="utf-8"))
-                    except (OSError, json.JSONDecodeError):
-                        pass
+        call_stdout = (t.get("call") or _EMPTY).get("stdout") or ""
+        if "[testforge:" in call_stdout:
+            for kind, value in _SENTINEL_RE.findall(call_stdout):
+                if kind == "screenshot":
+                    screenshot_path = value
+                else:
+                    net_path = value
+        if net_path:
+            try:
+                network_requests = _json_loads(Path(net_path).read_bytes())
+            except (OSError, json.JSONDecodeError):
+                pass
 
         extra_data: dict[str, Any] | None = None
         if network_requests:
             extra_data = {"network_requests": network_requests}
 
-        err_msg = str(longrepr)[:500] if longrepr else None
         err_stk = str(longrepr) if longrepr else None
+        err_msg = err_stk[:500] if err_stk else None
         results.append(
             {
                 "test_name": test_name,
@@ -829,6 +1201,53 @@ class RunnerConfig(TypedDict):
     framework: str      # pytest, playwright, jest, vitest, go-test
 
 
+# Every directory whose entries _detect_all_runners looks at, plus the parents
+# of the two-level ones: creating or deleting a config file (or a probed
+# subdirectory) bumps the mtime of exactly one of these.
+_RUNNER_WATCH: tuple[str, ...] = tuple(sorted(
+    {"."}
+    | set(_PLAYWRIGHT_SUBDIRS)
+    | {sub.split("/")[0] for sub in _PLAYWRIGHT_SUBDIRS}
+    | {f"{sub}/{sub2}" for sub in _PLAYWRIGHT_SUBDIRS for sub2 in _PLAYWRIGHT_NESTED}
+    | set(_PYTEST_SUBDIRS)
+)) + ("package.json",)
+
+# (project dir, runner flags, venv bin, PATH) → (layout stamp, runners)
+_RUNNER_CACHE: dict[tuple[Any, ...], tuple[tuple[int | None, ...], list[RunnerConfig]]] = {}
+
+
+def _runner_stamp(base: Path, venv_bin: Path | None) -> tuple[int | None, ...]:
+    """mtime_ns of every path in _RUNNER_WATCH (None where missing), plus *venv_bin*.
+
+    _RUNNER_WATCH is sorted, so parents come before their children and a
+    missing parent answers for its whole subtree without further stats.
+    """
+    root = str(base)
+    missing: set[str] = set()
+    stamp: list[int | None] = []
+    for rel in _RUNNER_WATCH:
+        parent = rel.rpartition("/")[0]
+        mtime: int | None = None
+        if parent not in missing:
+            try:
+                mtime = os.stat(os.path.join(root, rel)).st_mtime_ns
+            except OSError:
+                pass
+        if mtime is None:
+            missing.add(rel)
+        stamp.append(mtime)
+    if venv_bin is not None:
+        try:
+            stamp.append(os.stat(venv_bin).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _copy_runners(runners: list[RunnerConfig]) -> list[RunnerConfig]:
+    return [RunnerConfig(**{**r, "cmd": list(r["cmd"])}) for r in runners]
+
+
 def _detect_all_runners(
     project_path: str,
     *,
@@ -861,20 +1280,30 @@ def _detect_all_runners(
         )
         return [RunnerConfig(layer=layer, cmd=cmd, cwd=cwd, language="unknown", framework="unknown")]
 
+    # Reuse the last detection while no probed directory has changed.
+    cache_key = (
+        str(base), parallel_workers, retry_count, test_timeout, browser, venv_bin,
+        os.environ.get("PATH"),
+    )
+    stamp = _runner_stamp(base, venv_bin)
+    cached = _RUNNER_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return _copy_runners(cached[1])
+
     runners: list[RunnerConfig] = []
 
     # 1. Playwright (TypeScript/JavaScript)
-    npx = shutil.which("npx")
+    npx = _which("npx")
     if npx:
         playwright_configs = ("playwright.config.ts", "playwright.config.js", "playwright.config.mjs")
         search_dirs: list[Path] = [base]
-        for sub in ("e2e", "tests", "tests/e2e", "playwright", "e2e/tests", "frontend", "app", "apps/web", "packages/e2e"):
+        for sub in _PLAYWRIGHT_SUBDIRS:
             d = base / sub
             if d.is_dir():
                 search_dirs.append(d)
         for sub in list(search_dirs):
             if sub != base:
-                for sub2 in ("e2e", "tests", "playwright"):
+                for sub2 in _PLAYWRIGHT_NESTED:
                     d2 = sub / sub2
                     if d2.is_dir():
                         search_dirs.append(d2)
@@ -910,7 +1339,7 @@ def _detect_all_runners(
         "conftest.py", "requirements.txt",
     )
     _pytest_search: list[Path] = [base]
-    for _sub in ("backend", "api", "server", "src", "app", "lib", "tests"):
+    for _sub in _PYTEST_SUBDIRS:
         _d = base / _sub
         if _d.is_dir():
             _pytest_search.append(_d)
@@ -920,14 +1349,14 @@ def _detect_all_runners(
             if (_pytest_dir / cfg).exists():
                 if venv_bin is not None:
                     venv_pytest = (venv_bin / "pytest").resolve()
-                    pytest_bin = str(venv_pytest) if venv_pytest.exists() else (shutil.which("pytest") or sys.executable + " -m pytest")
+                    pytest_bin = str(venv_pytest) if venv_pytest.exists() else (_which("pytest") or sys.executable + " -m pytest")
                 else:
-                    pytest_bin = shutil.which("pytest") or sys.executable + " -m pytest"
+                    pytest_bin = _which("pytest") or sys.executable + " -m pytest"
                 _json_report_arg = "--json-report-file=.testforge_report.json"
                 if " " in pytest_bin:
-                    cmd = pytest_bin.split() + ["--json-report", _json_report_arg, "-v", "-p", "no:base_url"]
+                    cmd = pytest_bin.split() + ["--json-report", _json_report_arg, *_PYTEST_REPORT_OMIT, "-v", "-p", "no:base_url"]
                 else:
-                    cmd = [pytest_bin, "--json-report", _json_report_arg, "-v", "-p", "no:base_url"]
+                    cmd = [pytest_bin, "--json-report", _json_report_arg, *_PYTEST_REPORT_OMIT, "-v", "-p", "no:base_url"]
                 if parallel_workers > 1:
                     cmd += ["-n", str(parallel_workers)]
                 if retry_count > 0:
@@ -943,7 +1372,7 @@ def _detect_all_runners(
             break
 
     # 3. Go test
-    go_bin = shutil.which("go")
+    go_bin = _which("go")
     if go_bin and (base / "go.mod").exists():
         runners.append(RunnerConfig(
             layer="backend",
@@ -961,7 +1390,7 @@ def _detect_all_runners(
         pkg_json = base / "package.json"
         if not has_vitest_config and pkg_json.exists():
             try:
-                pkg_data = json.loads(pkg_json.read_text())
+                pkg_data = _json_loads(pkg_json.read_bytes())
                 all_deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
                 has_vitest_dep = "vitest" in all_deps
             except Exception:
@@ -979,7 +1408,7 @@ def _detect_all_runners(
     if npx and not any(r["framework"] == "vitest" for r in runners):
         if pkg_json.exists():
             try:
-                pkg_data = json.loads(pkg_json.read_text())
+                pkg_data = _json_loads(pkg_json.read_bytes())
                 all_deps = {**pkg_data.get("dependencies", {}), **pkg_data.get("devDependencies", {})}
                 if "jest" in all_deps:
                     runners.append(RunnerConfig(
@@ -992,7 +1421,9 @@ def _detect_all_runners(
             except Exception:
                 pass
 
-    if not runners:
+    if runners:
+        _RUNNER_CACHE[cache_key] = (stamp, _copy_runners(runners))
+    else:
         # Fall back to existing _detect_runner for error handling
         layer, cmd, cwd = _detect_runner(
             project_path,
@@ -1022,7 +1453,7 @@ def _parse_go_test_output(raw: str) -> list[dict[str, Any]]:
         if not line:
             continue
         try:
-            event = json.loads(line)
+            event = _json_loads(line)
         except json.JSONDecodeError:
             continue
 
@@ -1040,11 +1471,6 @@ def _parse_go_test_output(raw: str) -> list[dict[str, Any]]:
 
         if action in ("pass", "fail", "skip"):
             elapsed[key] = event.get("Elapsed", 0)
-            status_map = {
-                "pass": TestResultStatus.PASSED,
-                "fail": TestResultStatus.FAILED,
-                "skip": TestResultStatus.SKIPPED,
-            }
             output_text = "".join(outputs.get(key, []))
             err_msg = output_text[:500] if action == "fail" else None
             err_stk = output_text if action == "fail" else None
@@ -1053,7 +1479,7 @@ def _parse_go_test_output(raw: str) -> list[dict[str, Any]]:
                 "test_file": package,
                 "test_suite": package,
                 "test_layer": "backend",
-                "status": status_map.get(action, TestResultStatus.ERROR),
+                "status": _GO_TEST_STATUS.get(action, TestResultStatus.ERROR),
                 "duration_ms": int(elapsed.get(key, 0) * 1000),
                 "error_message": err_msg,
                 "error_stack": err_stk,
@@ -1073,13 +1499,13 @@ def _parse_jest_vitest_output(raw: str, framework: str = "jest") -> list[dict[st
 
     data = None
     try:
-        data = json.loads(raw)
+        data = _json_loads(raw)
     except json.JSONDecodeError:
         # Try to find JSON in output (Vitest may have extra lines)
         start = raw.find("{")
         if start != -1:
             try:
-                data = json.loads(raw[start:])
+                data = _json_loads(raw[start:])
             except json.JSONDecodeError:
                 pass
     if not data:
@@ -1098,13 +1524,7 @@ def _parse_jest_vitest_output(raw: str, framework: str = "jest") -> list[dict[st
             title = assertion.get("title", "")
             suite = " > ".join(ancestors) if ancestors else None
             status_raw = assertion.get("status", "passed")
-            status = {
-                "passed": TestResultStatus.PASSED,
-                "failed": TestResultStatus.FAILED,
-                "skipped": TestResultStatus.SKIPPED,
-                "pending": TestResultStatus.SKIPPED,
-                "todo": TestResultStatus.SKIPPED,
-            }.get(status_raw, TestResultStatus.ERROR)
+            status = _JEST_STATUS.get(status_raw, TestResultStatus.ERROR)
 
             failure_msgs = assertion.get("failureMessages", [])
             err_msg = failure_msgs[0][:500] if failure_msgs else None
@@ -1134,14 +1554,14 @@ async def _try_get_auth_token(backend_url: str, email: str, password: str) -> st
     """Attempt to authenticate with the project's backend and return a JWT token.
 
     Tries the most common login endpoint patterns used by FastAPI / Django / Rails
-    projects. Returns None if authentication fails or the backend is unreachable.
+    projects concurrently and returns the first token found. Returns None if authentication fails or the backend is unreachable.
     """
     try:
         import httpx
     except ImportError:
         return None
 
-    # (endpoint, json_body) pairs — tried in order
+    # (endpoint, json_body) pairs — probed concurrently, first token wins
     candidates = [
         ("/api/v1/auth/login",  {"email": email, "password": password}),
         ("/api/v1/auth/token",  {"username": email, "password": password}),
@@ -1152,43 +1572,192 @@ async def _try_get_auth_token(backend_url: str, email: str, password: str) -> st
     ]
 
     base = backend_url.rstrip("/")
+
+    async def _probe(client: Any, path: str, body: dict[str, str]) -> str | None:
+        try:
+            resp = await client.post(f"{base}{path}", json=body)
+        except Exception:
+            return None
+        if resp.status_code not in (200, 201):
+            return None
+        try:
+            data = resp.json()
+        except Exception:
+            return None
+        # Handle common token structures
+        token = (
+            data.get("access_token")
+            or data.get("token")
+            or data.get("accessToken")
+            or (data.get("data") or {}).get("access_token")
+            or (data.get("tokens") or {}).get("access")
+        )
+        if token:
+            logger.info("engine: auth token obtained from %s%s", base, path)
+            return str(token)
+        return None
+
+    # Serial probing cost up to 6 × 10s against an unreachable backend; firing
+    # all candidates at once bounds it to a single timeout.
     try:
         async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            for path, body in candidates:
-                try:
-                    resp = await client.post(f"{base}{path}", json=body)
-                except Exception:
-                    continue
-                if resp.status_code not in (200, 201):
-                    continue
-                try:
-                    data = resp.json()
-                except Exception:
-                    continue
-                # Handle common token structures
-                token = (
-                    data.get("access_token")
-                    or data.get("token")
-                    or data.get("accessToken")
-                    or (data.get("data") or {}).get("access_token")
-                    or (data.get("tokens") or {}).get("access")
-                )
-                if token:
-                    logger.info("engine: auth token obtained from %s%s", base, path)
-                    return str(token)
+            tasks = [asyncio.create_task(_probe(client, path, body)) for path, body in candidates]
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    token = await fut
+                    if token:
+                        return token
+            finally:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
     except Exception as exc:
         logger.debug("engine: _try_get_auth_token failed: %s", exc)
 
     return None
 
 
+# (backend_url, email, sha256(password)) → (token, monotonic expiry).  Back-to-back
+# runs reuse a still-valid token instead of logging in again; the per-key lock
+# collapses concurrent runs of the same project into a single login.
+_AUTH_TOKEN_CACHE: dict[tuple[str, str, bytes], tuple[str, float]] = {}
+_AUTH_TOKEN_LOCKS: dict[tuple[str, str, bytes], asyncio.Lock] = {}
+_AUTH_TOKEN_DEFAULT_TTL = 300.0  # seconds, for tokens without a readable `exp`
+_AUTH_TOKEN_EXPIRY_MARGIN = 30.0  # refresh this long before the token expires
+
+
+def _token_ttl(token: str) -> float:
+    """Seconds until *token* expires, read from its JWT ``exp`` claim when present."""
+    try:
+        payload = token.split(".")[1]
+        claims = _json_loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - time.time()
+    except Exception:
+        return _AUTH_TOKEN_DEFAULT_TTL
+
+
+@lru_cache(maxsize=64)
+def _decrypt_cached(ciphertext: str) -> str:
+    """``decrypt_value`` memoized per ciphertext; Fernet output never changes for a given input."""
+    return decrypt_value(ciphertext) or ""
+
+
+async def _get_auth_token_cached(backend_url: str, email: str, password: str) -> str | None:
+    """Return a cached auth token for these credentials, logging in only when needed."""
+    key = (backend_url, email, hashlib.sha256(password.encode()).digest())
+    async with _AUTH_TOKEN_LOCKS.setdefault(key, asyncio.Lock()):
+        cached = _AUTH_TOKEN_CACHE.get(key)
+        if cached and time.monotonic() < cached[1] - _AUTH_TOKEN_EXPIRY_MARGIN:
+            return cached[0]
+        token = await _try_get_auth_token(backend_url, email, password)
+        if token:
+            _AUTH_TOKEN_CACHE[key] = (token, time.monotonic() + _token_ttl(token))
+        else:
+            _AUTH_TOKEN_CACHE.pop(key, None)
+        return token
+
+
+async def _frontend_reachable(url: str, timeout: float = 5.0) -> bool:
+    """Non-blocking TCP check that the frontend at *url* accepts connections.
+
+    The result is handed to the E2E conftest via TESTFORGE_FRONTEND_UP so the
+    test process doesn't repeat a blocking probe of its own.
+    """
+    try:
+        p = urlparse(url)
+        host = p.hostname or "localhost"
+        port = p.port or (443 if p.scheme == "https" else 80)
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except Exception:
+        return False
+    writer.close()
+    with contextlib.suppress(Exception):
+        await writer.wait_closed()
+    return True
+
+
+# (command, PATH) → absolute executable; only hits are cached, so a tool
+# installed after a miss is still picked up on the next run.
+_RESOLVED_CMDS: dict[tuple[str, str | None], str] = {}
+
+
+def _resolve_command(name: str, path: str | None) -> str | None:
+    """``shutil.which(name, path=path)``, memoized for successful lookups."""
+    key = (name, path)
+    resolved = _RESOLVED_CMDS.get(key)
+    if resolved is None:
+        resolved = shutil.which(name, path=path)
+        if resolved is not None:
+            _RESOLVED_CMDS[key] = resolved
+    return resolved
+
+
+def _which(name: str) -> str | None:
+    """``shutil.which(name)`` on the current PATH, memoized like _resolve_command."""
+    return _resolve_command(name, os.environ.get("PATH"))
+
+
+def _result_rows(
+    run_id: str, results: list[dict[str, Any]], default_layer: str,
+) -> list[dict[str, Any]]:
+    """Column dicts for one executemany ``insert(TestResult)`` of *results*.
+
+    A single INSERT per batch avoids an ORM object (and flush) per result.
+    The version-4 ids come from one ``os.urandom`` call for the whole batch.
+    """
+    raw = os.urandom(16 * len(results))
+    return [
+        {
+            "id": str(UUID(bytes=raw[16 * i:16 * i + 16], version=4)),
+            "test_run_id": run_id,
+            "test_name": r["test_name"],
+            "test_file": r.get("test_file"),
+            "test_suite": r.get("test_suite"),
+            "test_layer": r.get("test_layer", default_layer),
+            "status": r["status"],
+            "duration_ms": r.get("duration_ms"),
+            "error_message": r.get("error_message"),
+            "error_stack": r.get("error_stack"),
+            "screenshot_path": r.get("screenshot_path"),
+            "extra_data": r.get("extra_data"),
+            "test_language": r.get("test_language"),
+            "test_framework": r.get("test_framework"),
+            "error_category": r.get("error_category"),
+        }
+        for i, r in enumerate(results)
+    ]
+
+
+async def _finalize_failed(db: AsyncSession, run_id: str, message: str) -> None:
+    """Mark the run FAILED with *message* in one UPDATE, commit, and broadcast it."""
+    await db.execute(
+        update(TestRun)
+        .where(TestRun.id == run_id)
+        .values(
+            status=TestRunStatus.FAILED,
+            error_message=message,
+            completed_at=datetime.now(timezone.utc),
+        )
+    )
+    await db.commit()
+    await _broadcast_run(run_id, {"status": "failed", "error_message": message})
+
+
 async def run_tests_for_project(project_id: str, run_id: str) -> None:
     """Background task: execute tests, persist results, update run status."""
     async with async_session_factory() as db:
-        await _execute(db, project_id, run_id)
+        # locked() and acquire() run with no await in between, so two runs
+        # can't both take the last slot.
+        if _run_slots.locked():
+            await _finalize_failed(db, run_id, f"Too many concurrent runs ({MAX_CONCURRENT_RUNS} max)")
+            return
+        async with _run_slots:
+            await _execute(db, project_id, run_id)
 
 
 _HARDCODED_BASE_URL_RE = re.compile(r'base_url="(https?://[^"]+)"')
+_SAFE_NAME_RE = re.compile(r"[^a-z0-9]+")
+_SLUG_RE = re.compile(r"[^a-z0-9/]+")
 
 
 def _patch_hardcoded_urls(code: str) -> str:
@@ -1207,19 +1776,9 @@ def _patch_hardcoded_urls(code: str) -> str:
     return patched
 
 
-def _auto_python_e2e(entry_point: str | None, test_name: str) -> str:
-    """Generate a Python pytest-playwright E2E test from a TypeScript accepted test.
-
-    Used when the user accepted a TypeScript E2E test before the scanner was
-    updated to generate Python tests.  We create a runnable Python equivalent
-    so the test actually executes (with screenshot capture on failure) rather
-    than appearing as a permanent "skipped" entry in the results.
-    """
-    path = entry_point or test_name
-    name = Path(path).stem
-    safe = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "page"
-    slug = re.sub(r"[^a-z0-9/]+", "-", name.lower()).strip("-")
-    return f'''"""Auto-generated Python E2E test — source: {path}"""
+# Module generated by _auto_python_e2e; str.format fields {path}/{slug}/{safe},
+# literal braces doubled.
+_PY_E2E_TMPL = '''"""Auto-generated Python E2E test — source: {path}"""
 import os
 
 import pytest
@@ -1255,6 +1814,21 @@ def test_{safe}_has_content(page: Page) -> None:
 '''
 
 
+def _auto_python_e2e(entry_point: str | None, test_name: str) -> str:
+    """Generate a Python pytest-playwright E2E test from a TypeScript accepted test.
+
+    Used when the user accepted a TypeScript E2E test before the scanner was
+    updated to generate Python tests.  We create a runnable Python equivalent
+    so the test actually executes (with screenshot capture on failure) rather
+    than appearing as a permanent "skipped" entry in the results.
+    """
+    path = entry_point or test_name
+    name = Path(path).stem
+    safe = _SAFE_NAME_RE.sub("_", name.lower()).strip("_") or "page"
+    slug = _SLUG_RE.sub("-", name.lower()).strip("-")
+    return _PY_E2E_TMPL.format(path=path, slug=slug, safe=safe)
+
+
 def _is_python_test_code(code: str) -> bool:
     """Return True only if the code looks like Python (not TypeScript/JavaScript).
 
@@ -1275,164 +1849,277 @@ def _is_python_test_code(code: str) -> bool:
     return True
 
 
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write *data* to *path* unless the file already holds exactly those bytes.
+
+    Generated conftests and tests are mostly identical run after run; a size
+    check plus a read-and-compare skips the rewrite (and its page-cache churn,
+    and pytest's bytecode-cache invalidation) in that case.  Changed files are
+    written to a temp sibling and renamed into place, so a concurrent pytest
+    never sees a half-written module.  Returns True when the file was written.
+    """
+    try:
+        if os.stat(path).st_size == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    tmp = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+# conftest.py written to tests/testforge/e2e/ with:
+# 1. TCP reachability check — skip ALL E2E tests instantly if frontend is down
+# 2. Playwright page timeout configuration (10s instead of default 30s)
+# 3. Screenshot-on-failure capture with sentinel for _parse_pytest_output()
+# 4. Network request capture with sentinel for _parse_pytest_output()
+# Kept as pre-encoded bytes so each run writes it with a single call.
+_E2E_CONFTEST_SRC: bytes = '''\
+"""Auto-generated TestForge conftest for E2E tests."""
+from __future__ import annotations
+
+import json
+import os
+import socket
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+except ImportError:  # orjson is optional in the project venv
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, default=str).encode("utf-8")
+
+SCREENSHOT_DIR = Path("/app/screenshots")
+SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
+
+NETWORK_DIR = Path("/app/network_captures")
+NETWORK_DIR.mkdir(parents=True, exist_ok=True)
+
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000").rstrip("/")
+_PLAYWRIGHT_TIMEOUT_MS = int(os.environ.get("PLAYWRIGHT_TIMEOUT_MS", "10000"))
+_FRONTEND_REACHABLE: bool | None = None
+
+
+def _check_frontend_tcp() -> bool:
+    """Quick TCP socket check — avoids 30s Playwright timeout per test.
+
+    The engine probes the frontend before launching pytest and passes the
+    answer in TESTFORGE_FRONTEND_UP; only probe here when it is absent.
+    """
+    known = os.environ.get("TESTFORGE_FRONTEND_UP")
+    if known in ("0", "1"):
+        return known == "1"
+    try:
+        p = urlparse(FRONTEND_URL)
+        host = p.hostname or "localhost"
+        port = p.port or (443 if p.scheme == "https" else 80)
+        with socket.create_connection((host, port), timeout=5):
+            return True
+    except Exception:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def _require_frontend():
+    """Skip all E2E tests instantly when frontend is not reachable (cached TCP check)."""
+    global _FRONTEND_REACHABLE
+    if _FRONTEND_REACHABLE is None:
+        _FRONTEND_REACHABLE = _check_frontend_tcp()
+    if not _FRONTEND_REACHABLE:
+        pytest.skip(f"Frontend not reachable at {FRONTEND_URL} — skipping E2E")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Store test outcome so screenshot fixture knows if the test failed."""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call":
+        item.testforge_failed = report.failed
+
+
+@pytest.fixture(autouse=True)
+def _testforge_capture(request):
+    """Set Playwright timeout, capture network + screenshot on failure."""
+    network_requests: list[dict] = []
+    page = request.node.funcargs.get("page")
+    if page is not None:
+        page.set_default_timeout(_PLAYWRIGHT_TIMEOUT_MS)
+        page.set_default_navigation_timeout(_PLAYWRIGHT_TIMEOUT_MS)
+
+        def _on_request(req):
+            network_requests.append({
+                "url": req.url,
+                "method": req.method,
+                "resource_type": req.resource_type,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            })
+
+        def _on_response(resp):
+            for entry in reversed(network_requests):
+                if entry.get("url") == resp.url:
+                    entry["status"] = resp.status
+                    entry["content_type"] = resp.headers.get("content-type", "")
+                    break
+
+        page.on("request", _on_request)
+        page.on("response", _on_response)
+
+    yield
+
+    test_name = request.node.name.replace(" ", "_").replace("/", "_")[:80]
+
+    # Always output network data (even for passing tests)
+    if network_requests:
+        net_file = NETWORK_DIR / f"tf_{test_name}.json"
+        net_file.write_bytes(_dumps(network_requests))
+        print(f"\\n[testforge:network]{net_file}", flush=True)
+
+    # Screenshot on failure only
+    if getattr(request.node, "testforge_failed", False) and page is not None:
+        path = SCREENSHOT_DIR / f"tf_{test_name}.png"
+        try:
+            page.screenshot(path=str(path), full_page=True)
+            print(f"\\n[testforge:screenshot]{path}", flush=True)
+        except Exception:
+            pass
+'''.encode()
+
+
+# blake2b(code) → syntax error message (None when valid).  Accepted tests are
+# rewritten on every run, so unchanged code is only parsed once per process.
+_SYNTAX_CACHE: dict[bytes, str | None] = {}
+_SYNTAX_CACHE_MAX = 4096
+
+
+def _syntax_error(code: str) -> str | None:
+    """Return the SyntaxError message for *code*, or None if it parses.
+
+    ``ast.parse`` stops after building the AST, skipping the bytecode
+    compilation that ``compile()`` would do only to be thrown away.
+    """
+    key = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    try:
+        return _SYNTAX_CACHE[key]
+    except KeyError:
+        pass
+    try:
+        ast.parse(code, "<generated>", "exec")
+        error = None
+    except SyntaxError as exc:
+        error = str(exc)
+    if len(_SYNTAX_CACHE) >= _SYNTAX_CACHE_MAX:
+        _SYNTAX_CACHE.clear()
+    _SYNTAX_CACHE[key] = error
+    return error
+
+
+def _clear_generated_tests(directory: Path, keep: Container[str] = ()) -> bool:
+    """Delete ``test_*.py`` files in *directory* except those named in *keep*;
+    return True if it has an ``__init__.py``.
+
+    One ``os.scandir`` pass serves both jobs, using the directory entries'
+    cached type info instead of a glob plus a separate ``exists()`` stat.
+    """
+    has_init = False
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name == "__init__.py":
+                has_init = True
+            elif (
+                name.startswith("test_") and name.endswith(".py")
+                and name not in keep and entry.is_file()
+            ):
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+    return has_init
+
+
 async def _write_accepted_tests_to_workspace(
     db: AsyncSession,
     project_id: str,
     run_cwd: str,
     run_id: str,
-) -> tuple[int, list[dict[str, Any]], int]:
+) -> tuple[int, list[dict[str, Any]], int, int]:
     """Write accepted GeneratedTest records to tests/testforge/ in the workspace.
 
     Only Python tests are written — TypeScript/Playwright tests require npx
     which is not available in the Docker image.  We detect language from the
     code itself (not just test_type) because the scanner sometimes mis-classifies.
-    Returns (written, ts_skipped_dicts, skipped_syntax).
+    Returns (written, ts_skipped_dicts, skipped_syntax, e2e_written).
     ts_skipped_dicts are pre-built result dicts (status=SKIPPED) to be merged
     into the parsed results so TypeScript tests appear in the results list.
     """
     from app.models.scanner import GeneratedTest  # lazy import to avoid circular deps
 
+    # Project only the columns used below: plain rows skip ORM identity-map
+    # and attribute instrumentation, and leave unused columns on the server.
     result = await db.execute(
-        select(GeneratedTest).where(
+        select(
+            GeneratedTest.id,
+            GeneratedTest.test_name,
+            GeneratedTest.entry_point,
+            GeneratedTest.test_type,
+            GeneratedTest.test_code,
+        ).where(
             GeneratedTest.project_id == project_id,
             GeneratedTest.accepted == True,  # noqa: E712
         )
     )
-    tests = result.scalars().all()
+    tests = result.all()
 
     if not tests:
-        return 0, [], 0
+        return 0, [], 0, 0
 
     testforge_dir = Path(run_cwd) / "tests" / "testforge"
-    testforge_dir.mkdir(parents=True, exist_ok=True)
-
     # Subdirectory for E2E/Playwright tests — separate layer detection via path prefix
     e2e_dir = testforge_dir / "e2e"
-    e2e_dir.mkdir(parents=True, exist_ok=True)
+    # One makedirs creates both levels
+    os.makedirs(e2e_dir, exist_ok=True)
 
-    # Clear previously written test files so rejected/deleted tests don't linger
-    for old_file in testforge_dir.glob("test_*.py"):
-        old_file.unlink(missing_ok=True)
-    for old_file in e2e_dir.glob("test_*.py"):
-        old_file.unlink(missing_ok=True)
+    # Write the E2E conftest (frontend reachability, timeouts, capture sentinels)
+    _write_if_changed(e2e_dir / "conftest.py", _E2E_CONFTEST_SRC)
 
-    # Write __init__.py so pytest discovers both directories
-    for d in (testforge_dir, e2e_dir):
-        init_file = d / "__init__.py"
-        if not init_file.exists():
-            init_file.write_text("# Auto-generated by TestForge\n")
-
-    # Write conftest.py with:
-    # 1. TCP reachability check — skip ALL E2E tests instantly if frontend is down
-    # 2. Playwright page timeout configuration (10s instead of default 30s)
-    # 3. Screenshot-on-failure capture with sentinel for _parse_pytest_output()
-    # 4. Network request capture with sentinel for _parse_pytest_output()
-    conftest_path = e2e_dir / "conftest.py"
-    conftest_path.write_text(
-        '"""Auto-generated TestForge conftest for E2E tests."""\n'
-        "from __future__ import annotations\n\n"
-        "import json\n"
-        "import os\n"
-        "import socket\n"
-        "from datetime import datetime, timezone\n"
-        "from pathlib import Path\n"
-        "from urllib.parse import urlparse\n\n"
-        "import pytest\n\n"
-        'SCREENSHOT_DIR = Path("/app/screenshots")\n'
-        "SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)\n\n"
-        'NETWORK_DIR = Path("/app/network_captures")\n'
-        "NETWORK_DIR.mkdir(parents=True, exist_ok=True)\n\n"
-        'FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:3000").rstrip("/")\n'
-        '_PLAYWRIGHT_TIMEOUT_MS = int(os.environ.get("PLAYWRIGHT_TIMEOUT_MS", "10000"))\n'
-        "_FRONTEND_REACHABLE: bool | None = None\n\n\n"
-        "def _check_frontend_tcp() -> bool:\n"
-        '    """Quick TCP socket check — avoids 30s Playwright timeout per test."""\n'
-        "    try:\n"
-        "        p = urlparse(FRONTEND_URL)\n"
-        '        host = p.hostname or "localhost"\n'
-        '        port = p.port or (443 if p.scheme == "https" else 80)\n'
-        "        with socket.create_connection((host, port), timeout=5):\n"
-        "            return True\n"
-        "    except Exception:\n"
-        "        return False\n\n\n"
-        "@pytest.fixture(autouse=True)\n"
-        "def _require_frontend():\n"
-        '    """Skip all E2E tests instantly when frontend is not reachable (cached TCP check)."""\n'
-        "    global _FRONTEND_REACHABLE\n"
-        "    if _FRONTEND_REACHABLE is None:\n"
-        "        _FRONTEND_REACHABLE = _check_frontend_tcp()\n"
-        "    if not _FRONTEND_REACHABLE:\n"
-        '        pytest.skip(f"Frontend not reachable at {FRONTEND_URL} — skipping E2E")\n\n\n'
-        "@pytest.hookimpl(hookwrapper=True)\n"
-        "def pytest_runtest_makereport(item, call):\n"
-        '    """Store test outcome so screenshot fixture knows if the test failed."""\n'
-        "    outcome = yield\n"
-        "    report = outcome.get_result()\n"
-        '    if report.when == "call":\n'
-        "        item.testforge_failed = report.failed\n\n\n"
-        "@pytest.fixture(autouse=True)\n"
-        "def _testforge_capture(request):\n"
-        '    """Set Playwright timeout, capture network + screenshot on failure."""\n'
-        "    network_requests: list[dict] = []\n"
-        '    page = request.node.funcargs.get("page")\n'
-        "    if page is not None:\n"
-        "        page.set_default_timeout(_PLAYWRIGHT_TIMEOUT_MS)\n"
-        "        page.set_default_navigation_timeout(_PLAYWRIGHT_TIMEOUT_MS)\n\n"
-        "        def _on_request(req):\n"
-        "            network_requests.append({\n"
-        '                "url": req.url,\n'
-        '                "method": req.method,\n'
-        '                "resource_type": req.resource_type,\n'
-        '                "timestamp": datetime.now(timezone.utc).isoformat(),\n'
-        "            })\n\n"
-        "        def _on_response(resp):\n"
-        "            for entry in reversed(network_requests):\n"
-        '                if entry.get("url") == resp.url:\n'
-        '                    entry["status"] = resp.status\n'
-        '                    entry["content_type"] = resp.headers.get("content-type", "")\n'
-        "                    break\n\n"
-        '        page.on("request", _on_request)\n'
-        '        page.on("response", _on_response)\n\n'
-        "    yield\n\n"
-        '    test_name = request.node.name.replace(" ", "_").replace("/", "_")[:80]\n\n'
-        "    # Always output network data (even for passing tests)\n"
-        "    if network_requests:\n"
-        '        net_file = NETWORK_DIR / f"tf_{test_name}.json"\n'
-        "        net_file.write_text(json.dumps(network_requests, default=str))\n"
-        '        print(f"\\n[testforge:network]{net_file}", flush=True)\n\n'
-        "    # Screenshot on failure only\n"
-        '    if getattr(request.node, "testforge_failed", False) and page is not None:\n'
-        '        path = SCREENSHOT_DIR / f"tf_{test_name}.png"\n'
-        "        try:\n"
-        "            page.screenshot(path=str(path), full_page=True)\n"
-        '            print(f"\\n[testforge:screenshot]{path}", flush=True)\n'
-        "        except Exception:\n"
-        "            pass\n",
-        encoding="utf-8",
-    )
-
-    written = 0
     ts_skipped: list[dict[str, Any]] = []
     skipped_syntax = 0
-    for test in tests:
-        if not _is_python_test_code(test.test_code):
+    # (test id, destination, file bytes) — written off the event loop below
+    pending: list[tuple[Any, Path, bytes]] = []
+    # ast.parse is CPU-bound: syntax-check every Python test in one worker-thread
+    # call so a large batch doesn't hold up the event loop.
+    python_flags = [_is_python_test_code(t.test_code) for t in tests]
+    syntax_errors = await asyncio.to_thread(
+        lambda: [_syntax_error(t.test_code) if py else None for t, py in zip(tests, python_flags, strict=True)]
+    )
+    for test, is_python, syntax_error in zip(tests, python_flags, syntax_errors, strict=True):
+        if not is_python:
             is_e2e_type = test.test_type in ("e2e", "component")
             if is_e2e_type:
                 # Auto-convert TypeScript E2E → Python pytest-playwright so the test
                 # actually runs in Docker (Playwright Python is pre-installed) and
                 # captures screenshots on failure.
                 python_code = _auto_python_e2e(test.entry_point, test.test_name)
-                safe_name = re.sub(r"[^a-z0-9]+", "_", test.test_name.lower()).strip("_") or "test"
+                safe_name = _SAFE_NAME_RE.sub("_", test.test_name.lower()).strip("_") or "test"
                 uid = str(test.id).replace("-", "")[:8]
                 e2e_path = e2e_dir / f"test_{safe_name}_{uid}.py"
-                try:
-                    e2e_path.write_text(python_code, encoding="utf-8")
-                    written += 1
-                    logger.debug(
-                        "engine: auto-converted TypeScript E2E test %s → Python", test.id
-                    )
-                except OSError as exc:
-                    logger.warning("engine: could not write E2E test %s: %s", test.id, exc)
+                pending.append((test.id, e2e_path, python_code.encode("utf-8")))
+                logger.debug("engine: auto-converted TypeScript E2E test %s → Python", test.id)
                 continue  # handled — do not add to ts_skipped
 
             # Non-E2E TypeScript (e.g. API tests written in TS) — truly can't run
@@ -1454,17 +2141,15 @@ async def _write_accepted_tests_to_workspace(
 
         # Validate Python syntax before writing — skip files with any syntax error
         # (e.g. function names derived from "home.spec.ts" → "test_home.spec()")
-        try:
-            compile(test.test_code, "<generated>", "exec")
-        except SyntaxError as exc:
+        if syntax_error is not None:
             skipped_syntax += 1
             logger.warning(
                 "engine: skipping test %s (%s) — syntax error: %s",
-                test.id, test.test_name, exc,
+                test.id, test.test_name, syntax_error,
             )
             continue
 
-        safe_name = re.sub(r"[^a-z0-9]+", "_", test.test_name.lower()).strip("_") or "test"
+        safe_name = _SAFE_NAME_RE.sub("_", test.test_name.lower()).strip("_") or "test"
         uid = str(test.id).replace("-", "")[:8]
         filename = f"test_{safe_name}_{uid}.py"
 
@@ -1479,34 +2164,49 @@ async def _write_accepted_tests_to_workspace(
         if 'base_url="http' in code and 'os.environ' not in code:
             code = _patch_hardcoded_urls(code)
 
-        try:
-            filepath.write_text(code + "\n", encoding="utf-8")
+        pending.append((test.id, filepath, (code + "\n").encode("utf-8")))
+
+    # Blocking file writes run in worker threads so large projects don't stall
+    # the event loop (and other runs' log streaming) while hundreds of files land.
+    # Files whose content is unchanged since the last run are left untouched.
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(_write_if_changed, path, data) for _, path, data in pending),
+        return_exceptions=True,
+    )
+    written = 0
+    current: set[Path] = set()
+    for (test_id, path, _), outcome in zip(pending, outcomes, strict=True):
+        if isinstance(outcome, OSError):
+            logger.warning("engine: could not write accepted test %s: %s", test_id, outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
             written += 1
-        except OSError as exc:
-            logger.warning("engine: could not write accepted test %s: %s", test.id, exc)
+            current.add(path)
+
+    # Remove files from earlier runs so rejected/deleted tests don't linger, and
+    # write __init__.py so pytest discovers both directories.  Exclusive create
+    # ("x") never clobbers one a concurrent run wrote in the meantime.
+    for d in (testforge_dir, e2e_dir):
+        if not _clear_generated_tests(d, keep={p.name for p in current if p.parent == d}):
+            try:
+                with open(d / "__init__.py", "xb") as f:
+                    f.write(b"# Auto-generated by TestForge\n")
+            except FileExistsError:
+                pass
 
     logger.info(
         "engine: wrote %d Python test files for project %s (%d TS/E2E skipped, %d syntax errors)",
         written, project_id, len(ts_skipped), skipped_syntax,
     )
-    return written, ts_skipped, skipped_syntax
+    e2e_written = sum(1 for p in current if p.parent == e2e_dir)
+    return written, ts_skipped, skipped_syntax, e2e_written
 
 
-def _inject_testforge_conftest(run_cwd: str) -> None:
-    """Write a root-level conftest.py that captures screenshots + network on failure.
-
-    The conftest is non-invasive: the autouse fixture only activates its
-    Playwright hooks when a ``page`` fixture is present in the test.  For
-    non-Playwright tests it simply yields and does nothing.
-
-    Sentinels printed to stdout:
-    - ``[testforge:screenshot]/app/screenshots/tf_<name>.png``
-    - ``[testforge:network]/app/network_captures/tf_<name>.json``
+_CONFTEST_MARKER = "# testforge-injected-conftest"
 
-    These are parsed by :func:`_parse_pytest_output` to populate the
-    Screenshots and Network tabs in the frontend.
-    """
-    conftest_code = '''\
+# Root conftest injected by _inject_testforge_conftest (marker line included).
+_ROOT_CONFTEST_SRC: bytes = (_CONFTEST_MARKER + "\n" + '''\
 """TestForge root conftest — screenshot + network capture for Playwright tests."""
 from __future__ import annotations
 
@@ -1516,6 +2216,15 @@ from pathlib import Path
 
 import pytest
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+except ImportError:  # orjson is optional in the project venv
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, default=str).encode("utf-8")
+
 SCREENSHOT_DIR = Path("/app/screenshots")
 SCREENSHOT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -1565,7 +2274,7 @@ def _testforge_capture(request):
     # Always output network data (even for passing tests)
     if network_requests:
         net_file = NETWORK_DIR / f"tf_{test_name}.json"
-        net_file.write_text(json.dumps(network_requests, default=str))
+        net_file.write_bytes(_dumps(network_requests))
         print(f"\\n[testforge:network]{net_file}", flush=True)
 
     # Screenshot on failure only
@@ -1576,24 +2285,66 @@ def _testforge_capture(request):
             print(f"\\n[testforge:screenshot]{path}", flush=True)
         except Exception:
             pass
-'''
+''').encode("utf-8")
+
+
+# run_cwd → (mtime_ns, size) of conftest.py / conftest_testforge.py as left by
+# the last injection; lets repeat runs on an untouched workspace skip the work.
+_CONFTEST_STAMPS: dict[str, tuple[tuple[int, int] | None, tuple[int, int] | None]] = {}
+
+
+def _conftest_stamp(run_cwd: str) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
+    """(mtime_ns, size) of the two conftest files in *run_cwd*, None where missing."""
+    stamps: list[tuple[int, int] | None] = []
+    for name in ("conftest.py", "conftest_testforge.py"):
+        try:
+            st = os.stat(os.path.join(run_cwd, name))
+        except OSError:
+            stamps.append(None)
+        else:
+            stamps.append((st.st_mtime_ns, st.st_size))
+    return stamps[0], stamps[1]
+
+
+def _inject_testforge_conftest(run_cwd: str) -> None:
+    """Write a root-level conftest.py that captures screenshots + network on failure.
+
+    The conftest is non-invasive: the autouse fixture only activates its
+    Playwright hooks when a ``page`` fixture is present in the test.  For
+    non-Playwright tests it simply yields and does nothing.
+
+    Sentinels printed to stdout:
+    - ``[testforge:screenshot]/app/screenshots/tf_<name>.png``
+    - ``[testforge:network]/app/network_captures/tf_<name>.json``
+
+    These are parsed by :func:`_parse_pytest_output` to populate the
+    Screenshots and Network tabs in the frontend.
+    """
+    stamp = _conftest_stamp(run_cwd)
+    if stamp[0] is not None and _CONFTEST_STAMPS.get(run_cwd) == stamp:
+        return
+    _write_testforge_conftest(run_cwd)
+    _CONFTEST_STAMPS[run_cwd] = _conftest_stamp(run_cwd)
+
+
+def _write_testforge_conftest(run_cwd: str) -> None:
+    """Write our conftest into *run_cwd*, or hook it in beside the project's own."""
     conftest_path = Path(run_cwd) / "conftest.py"
 
     # Don't overwrite an existing conftest that the project itself owns.
     # If the project has its own conftest, write ours as a separate file
     # and import it from the existing conftest.
-    _MARKER = "# testforge-injected-conftest"
     if conftest_path.exists():
         try:
             existing = conftest_path.read_text(encoding="utf-8")
-            if _MARKER not in existing:
+            if _CONFTEST_MARKER not in existing:
                 # Project has its own conftest — write ours as a plugin instead
                 plugin_path = Path(run_cwd) / "conftest_testforge.py"
-                plugin_path.write_text(f"{_MARKER}\n{conftest_code}", encoding="utf-8")
+                _write_if_changed(plugin_path, _ROOT_CONFTEST_SRC)
                 # Prepend an import of our plugin into the existing conftest
                 if "conftest_testforge" not in existing:
                     conftest_path.write_text(
-                        f"import conftest_testforge  # noqa: F401  {_MARKER}\n{existing}",
+                        f"import conftest_testforge  # noqa: F401  {_CONFTEST_MARKER}\n{existing}",
                         encoding="utf-8",
                     )
                 logger.info("engine: injected testforge conftest as plugin at %s", plugin_path)
@@ -1601,24 +2352,131 @@ def _testforge_capture(request):
         except OSError:
             pass
 
-    conftest_path.write_text(f"{_MARKER}\n{conftest_code}", encoding="utf-8")
-    logger.info("engine: wrote testforge conftest at %s", conftest_path)
+    if _write_if_changed(conftest_path, _ROOT_CONFTEST_SRC):
+        logger.info("engine: wrote testforge conftest at %s", conftest_path)
+
+
+def _parse_runner_results(
+    framework: str,
+    run_cwd: str,
+    report_name: str,
+    stdout_text: str,
+    fresh_after_ns: int,
+) -> list[dict[str, Any]]:
+    """Parse one runner's results from its report file or captured stdout.
+
+    Blocking (file reads, JSON decoding, screenshot copies); _execute runs it
+    in a worker thread so the event loop keeps serving log broadcasts.
+    """
+    runner_parsed: list[dict[str, Any]] = []
+
+    if framework == "playwright":
+        runner_parsed = _parse_playwright_output(stdout_text)
+    elif framework == "pytest":
+        candidates = (report_name, ".testforge_report.json", ".report.json", "report.json")
+        # One directory listing tells which candidates exist, instead of an
+        # open() attempt per name.  Reports older than this runner are
+        # leftovers (or the project's own files) and are neither parsed
+        # nor deleted.
+        try:
+            with os.scandir(run_cwd) as it:
+                present = {
+                    e.name for e in it
+                    if e.name in candidates and e.stat().st_mtime_ns >= fresh_after_ns
+                }
+        except OSError:
+            present = set()
+        for rname in candidates:
+            if rname not in present:
+                continue
+            report_file = Path(run_cwd) / rname
+            # read_bytes() sizes its buffer from fstat, so even a multi-MB
+            # report arrives in a single read() rather than small chunks.
+            try:
+                report = _json_loads(report_file.read_bytes())
+            except OSError:
+                continue
+            except ValueError:
+                report = None  # truncated/corrupt — try the next candidate
+            if isinstance(report, dict):
+                runner_parsed = _parse_pytest_report(report)
+            try:
+                report_file.unlink(missing_ok=True)
+            except OSError:
+                pass
+            if runner_parsed:
+                break
+        if not runner_parsed and stdout_text.strip():
+            runner_parsed = _parse_pytest_output(stdout_text)
+    elif framework == "go-test":
+        runner_parsed = _parse_go_test_output(stdout_text)
+    elif framework in ("jest", "vitest"):
+        runner_parsed = _parse_jest_vitest_output(stdout_text, framework=framework)
+
+    return runner_parsed
+
+
+# KEY=value lines of a .env file: one C-level scan over the whole buffer instead
+# of per-line strip/startswith/partition.  Comment lines can't match (a key may
+# not start with '#'); values keep inline '#' as before.
+_DOTENV_LINE_RE = re.compile(r"^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+
+
+def _parse_dotenv(text: str) -> list[tuple[str, str]]:
+    """Return (key, value) pairs from dotenv *text*, with surrounding quotes stripped."""
+    return [(key, val.strip("'\"")) for key, val in _DOTENV_LINE_RE.findall(text)]
+
+
+# path → (mtime_ns, size, pairs) for the workspace .env files.
+_DOTENV_CACHE: dict[Path, tuple[int, int, list[tuple[str, str]]]] = {}
+
+
+def _load_dotenv_cached(path: Path) -> list[tuple[str, str]] | None:
+    """(key, value) pairs of the .env file at *path*, or None if it can't be read.
+
+    Values already have localhost URLs translated for Docker.  The parse is
+    reused until the file's mtime or size changes.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    hit = _DOTENV_CACHE.get(path)
+    if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+        return hit[2]
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    # Translate localhost URLs so Docker tests can reach host services
+    pairs = [(key, _fix_host_url(val)) for key, val in _parse_dotenv(text)]
+    _DOTENV_CACHE[path] = (st.st_mtime_ns, st.st_size, pairs)
+    return pairs
 
 
 async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
     started = datetime.now(timezone.utc)
-
-    # ── Load project + config ─────────────────────────────────────────────────
-    proj_result = await db.execute(select(Project).where(Project.id == project_id))
-    project = proj_result.scalar_one_or_none()
-    if not project:
+    # Duration is measured on the monotonic clock so wall-clock jumps can't skew it
+    started_mono = time.monotonic_ns()
+
+    # ── Load project + config + run (one round-trip) ──────────────────────────
+    row = (
+        await db.execute(
+            select(Project, ProjectConfig, TestRun)
+            .outerjoin(ProjectConfig, ProjectConfig.project_id == Project.id)
+            .outerjoin(TestRun, TestRun.id == run_id)
+            .where(Project.id == project_id)
+        )
+    ).first()
+    if row is None:
         logger.error("engine: project %s not found", project_id)
         return
-
-    cfg_result = await db.execute(
-        select(ProjectConfig).where(ProjectConfig.project_id == project_id)
-    )
-    config: ProjectConfig | None = cfg_result.scalar_one_or_none()
+    project: Project = row[0]
+    config: ProjectConfig | None = row[1]
+    test_run: TestRun | None = row[2]
+    if not test_run:
+        logger.error("engine: run %s not found", run_id)
+        return
 
     # env_vars stored in playwright_config.env_vars
     env_vars: dict[str, str] = {}
@@ -1632,12 +2490,11 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
     # Inject credentials as env vars so test suites can use them directly,
     # and try to obtain a JWT token via the project's login endpoint.
     if config:
-        from app.core.security.encryption import decrypt_value
         email = config.test_login_email or ""
         password = ""
         if config.test_login_password:
             try:
-                password = decrypt_value(config.test_login_password)
+                password = _decrypt_cached(config.test_login_password)
             except Exception:
                 password = config.test_login_password  # use as-is if not encrypted
 
@@ -1658,9 +2515,14 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
             if "FRONTEND_URL" not in env_vars:
                 env_vars["FRONTEND_URL"] = frontend_url
 
-        # Try to obtain a JWT token so tests don't need to log in themselves
-        if email and password and backend_url and "TEST_AUTH_TOKEN" not in env_vars:
-            token = await _try_get_auth_token(backend_url, email, password)
+        # Try to obtain a JWT token so tests don't need to log in themselves —
+        # unless the project config already supplies one under any of the
+        # names we would inject (and would otherwise overwrite).
+        needs_token = not any(
+            name in env_vars for name in ("TEST_AUTH_TOKEN", "ACCESS_TOKEN", "AUTHORIZATION")
+        )
+        if needs_token and email and password and backend_url:
+            token = await _get_auth_token_cached(backend_url, email, password)
             if token:
                 env_vars["TEST_AUTH_TOKEN"] = token
                 env_vars["ACCESS_TOKEN"] = token
@@ -1670,12 +2532,6 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
     project_path = _get_effective_path(str(project.id), project.path)
 
     # ── Mark run as RUNNING early so install logs appear in the frontend ──────
-    run_result = await db.execute(select(TestRun).where(TestRun.id == run_id))
-    test_run: TestRun | None = run_result.scalar_one_or_none()
-    if not test_run:
-        logger.error("engine: run %s not found", run_id)
-        return
-
     test_run.status = TestRunStatus.RUNNING
     test_run.started_at = started
     await db.commit()
@@ -1684,29 +2540,22 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
     # ── Per-project venv + workspace env vars (only when workspace is synced) ──
     venv_bin: Path | None = None
     # Use absolute path for all workspace operations to avoid cwd-relative issues
-    ws_path = (Path("workspace") / str(project.id)).resolve()
-    is_workspace = project_path == str(ws_path) or project_path == str(Path("workspace") / str(project.id))
+    ws_rel = os.path.join("workspace", str(project.id))
+    ws_path = Path(ws_rel).resolve()
+    # _get_effective_path returns ws_rel itself when the workspace is used
+    is_workspace = project_path in (ws_rel, str(ws_path))
 
     if is_workspace:
         # 1. Auto-load .env vars from the synced workspace.
         #    Explicit project config always takes precedence (don't override).
         for dotenv_name in (".env", ".env.local", ".env.test"):
             dotenv_file = ws_path / dotenv_name
-            if dotenv_file.exists():
-                try:
-                    for line in dotenv_file.read_text(encoding="utf-8").splitlines():
-                        line = line.strip()
-                        if not line or line.startswith("#") or "=" not in line:
-                            continue
-                        key, _, val = line.partition("=")
-                        key = key.strip()
-                        val = val.strip().strip("'\"")
-                        if key and key not in env_vars:
-                            # Translate localhost URLs so Docker tests can reach host services
-                            env_vars[key] = _fix_host_url(val)
-                    logger.info("engine: loaded env from %s", dotenv_file)
-                except OSError:
-                    pass
+            pairs = _load_dotenv_cached(dotenv_file)
+            if pairs is not None:
+                for key, val in pairs:
+                    if key not in env_vars:
+                        env_vars[key] = val
+                logger.info("engine: loaded env from %s", dotenv_file)
 
         # 2. Create/update per-project isolated venv with absolute paths.
         #    Pass run_id so install output streams to the Test Logs panel.
@@ -1726,39 +2575,29 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
             venv_bin=venv_bin,
         )
     except RuntimeError as exc:
-        test_run.status = TestRunStatus.FAILED
-        test_run.error_message = str(exc)
-        test_run.completed_at = datetime.now(timezone.utc)
-        await db.commit()
-        await _broadcast_run(run_id, {"status": "failed", "error_message": str(exc)})
         logger.warning("engine: %s", exc)
+        await _finalize_failed(db, run_id, str(exc))
         return
 
     # ── Build subprocess env (inherit + inject project vars) ──────────────────
     proc_env = {**os.environ, **env_vars}
 
-    # ── Concurrency guard ─────────────────────────────────────────────────────
-    if len(_running_processes) >= MAX_CONCURRENT_RUNS:
-        test_run.status = TestRunStatus.FAILED
-        test_run.error_message = f"Too many concurrent runs ({MAX_CONCURRENT_RUNS} max)"
-        test_run.completed_at = datetime.now(timezone.utc)
-        await db.commit()
-        await _broadcast_run(run_id, {
-            "status": "failed", "error_message": test_run.error_message,
-        })
-        return
-
     # Use the first runner's layer/cwd for backwards-compatible pre-run steps
     primary_layer = runners[0]["layer"]
     primary_cwd = runners[0]["cwd"]
 
     # ── Write accepted scan tests to workspace ────────────────────────────────
     ts_skipped: list[dict[str, Any]] = []
+    frontend_probe: asyncio.Task[bool] | None = None
     if any(r["framework"] == "pytest" for r in runners) and is_workspace:
         pytest_cwd = next((r["cwd"] for r in runners if r["framework"] == "pytest"), primary_cwd)
-        written, ts_skipped, skipped_syntax = await _write_accepted_tests_to_workspace(
+        written, ts_skipped, skipped_syntax, e2e_written = await _write_accepted_tests_to_workspace(
             db, project_id, pytest_cwd, run_id
         )
+        # Probe the frontend for the E2E conftest while the conftest is injected.
+        # Without E2E tests TESTFORGE_FRONTEND_UP stays unset and nothing waits.
+        if e2e_written and env_vars.get("FRONTEND_URL"):
+            frontend_probe = asyncio.create_task(_frontend_reachable(env_vars["FRONTEND_URL"]))
         if written or ts_skipped or skipped_syntax:
             parts = [f"[testforge] {written} Python test file(s) loaded"]
             if ts_skipped:
@@ -1774,162 +2613,180 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
                 _inject_testforge_conftest(runner["cwd"])
             except Exception as exc:
                 logger.warning("engine: could not inject testforge conftest: %s", exc)
+    if frontend_probe is not None:
+        proc_env["TESTFORGE_FRONTEND_UP"] = "1" if await frontend_probe else "0"
 
     # ── Multi-runner execution loop ──────────────────────────────────────────
     parsed: list[dict[str, Any]] = []
+    persist: asyncio.Task[Any] | None = None
+    try:
+        for runner_idx, runner in enumerate(runners):
+            cmd = runner["cmd"]
+            run_cwd = runner["cwd"]
+            layer = runner["layer"]
+            framework = runner["framework"]
+            language = runner["language"]
+
+            # ── Pre-flight checks ──────────────────────────────────────────────
+            exec_path = Path(cmd[0])
+            if not exec_path.is_absolute():
+                resolved = _resolve_command(cmd[0], proc_env.get("PATH"))
+                if resolved and os.sep not in cmd[0]:
+                    # Spawn the resolved path so exec doesn't walk PATH again
+                    cmd = [resolved, *cmd[1:]]
+                exec_path = Path(resolved or cmd[0])
+            if not exec_path.exists():
+                await _broadcast_run(run_id, {
+                    "log": f"[skip] {framework}: executable not found ({cmd[0]!r})"
+                })
+                logger.warning("engine: skipping runner %s — executable not found: %s", framework, cmd[0])
+                continue
+            if not Path(run_cwd).is_dir():
+                await _broadcast_run(run_id, {
+                    "log": f"[skip] {framework}: cwd not found ({run_cwd!r})"
+                })
+                continue
 
-    async def _stream_to_logs(stream: asyncio.StreamReader, buf: list[str]) -> None:
-        """Read a stream line-by-line and broadcast each line to Test Logs."""
-        while True:
-            raw_line = await stream.readline()
-            if not raw_line:
-                break
-            line = raw_line.decode("utf-8", errors="replace").rstrip()
-            buf.append(line)
-            if line.strip():
-                await _broadcast_run(run_id, {"log": f"[test] {line}"})
-
-    for runner_idx, runner in enumerate(runners):
-        cmd = runner["cmd"]
-        run_cwd = runner["cwd"]
-        layer = runner["layer"]
-        framework = runner["framework"]
-        language = runner["language"]
-
-        # ── Pre-flight checks ──────────────────────────────────────────────
-        exec_path = Path(cmd[0])
-        if not exec_path.is_absolute():
-            exec_path = Path(shutil.which(cmd[0]) or cmd[0])
-        if not exec_path.exists():
-            await _broadcast_run(run_id, {
-                "log": f"[skip] {framework}: executable not found ({cmd[0]!r})"
-            })
-            logger.warning("engine: skipping runner %s — executable not found: %s", framework, cmd[0])
-            continue
-        if not Path(run_cwd).is_dir():
-            await _broadcast_run(run_id, {
-                "log": f"[skip] {framework}: cwd not found ({run_cwd!r})"
-            })
-            continue
-
-        # Unique report file per runner for pytest
-        report_name = f".testforge_report_{runner_idx}.json"
-        if framework == "pytest":
-            cmd = [c.replace(".testforge_report.json", report_name) for c in cmd]
-
-        logger.info(
-            "engine: [%d/%d] running %s (%s) in cwd=%s",
-            runner_idx + 1, len(runners), framework, language, run_cwd,
-        )
-        await _broadcast_run(run_id, {"log": f"[run] [{runner_idx + 1}/{len(runners)}] {framework} ({language}) in {run_cwd}"})
-
-        # ── Execute subprocess ─────────────────────────────────────────────
-        returncode = 1
-        stdout_text = ""
-        stderr_text = ""
+            # Unique report file per runner for pytest
+            report_name = f".testforge_report_{runner_idx}.json"
+            if framework == "pytest":
+                cmd = [c.replace(".testforge_report.json", report_name) for c in cmd]
 
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=run_cwd,
-                env=proc_env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            logger.info(
+                "engine: [%d/%d] running %s (%s) in cwd=%s",
+                runner_idx + 1, len(runners), framework, language, run_cwd,
             )
-            _running_processes[run_id] = proc
+            await _broadcast_run(run_id, {"log": f"[run] [{runner_idx + 1}/{len(runners)}] {framework} ({language}) in {run_cwd}"})
 
-            stdout_lines: list[str] = []
-            stderr_lines: list[str] = []
-            t_out = asyncio.create_task(_stream_to_logs(proc.stdout, stdout_lines))  # type: ignore[arg-type]
-            t_err = asyncio.create_task(_stream_to_logs(proc.stderr, stderr_lines))  # type: ignore[arg-type]
+            # ── Execute subprocess ─────────────────────────────────────────────
+            returncode = 1
+            stdout_text = ""
+            stderr_text = ""
 
+            # Allow for filesystems with coarse (up to 2 s) mtime resolution.
+            fresh_after_ns = time.time_ns() - 2_000_000_000
+            log_q: asyncio.Queue[str | None] = asyncio.Queue()
+            drainer = asyncio.create_task(_broadcast_drainer(run_id, log_q))
             try:
-                await asyncio.wait_for(asyncio.gather(t_out, t_err), timeout=300)
-            except asyncio.TimeoutError:
-                t_out.cancel()
-                t_err.cancel()
-                proc.kill()
-                await _broadcast_run(run_id, {"log": f"[warn] {framework} timed out after 5 minutes"})
-                continue
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=run_cwd,
+                    env=proc_env,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    # Own session, so cancel_run can take down the runner's
+                    # workers (xdist, Playwright browsers) along with it.
+                    start_new_session=True,
+                )
+                _running_processes[run_id] = proc
+                _widen_output_pipes(proc)
 
-            await proc.wait()
-            returncode = proc.returncode or 0
-            stdout_text = "\n".join(stdout_lines)
-            stderr_text = "\n".join(stderr_lines)
+                # pytest results come from the JSON report, so only its stdout tail is
+                # kept; the other runners are parsed from stdout and keep all of it.
+                stdout_lines: deque[str] = deque(
+                    maxlen=_OUTPUT_TAIL_LINES if framework == "pytest" else None,
+                )
+                stderr_lines: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+                # The timeout bounds the process itself; the readers drain to EOF
+                # and a killed process is always reaped.  The TaskGroup guarantees
+                # neither reader outlives this block, whatever exits it.
+                timed_out = False
+                async with asyncio.TaskGroup() as tg:
+                    t_out = tg.create_task(_stream_to_logs(proc.stdout, stdout_lines, log_q))  # type: ignore[arg-type]
+                    t_err = tg.create_task(_stream_to_logs(proc.stderr, stderr_lines, log_q))  # type: ignore[arg-type]
+                    try:
+                        await asyncio.wait_for(proc.wait(), timeout=300)
+                    except asyncio.TimeoutError:
+                        await _terminate_process_group(proc)
+                        timed_out = True
+                    # A grandchild can keep the pipes open after the process exits
+                    _, stragglers = await asyncio.wait((t_out, t_err), timeout=5)
+                    for t in stragglers:
+                        t.cancel()
+
+                if timed_out:
+                    # Flush queued output so the warning lands after it
+                    log_q.put_nowait(None)
+                    await drainer
+                    await _broadcast_run(run_id, {"log": f"[warn] {framework} timed out after 5 minutes"})
+                    continue
 
-        except Exception as exc:
-            await _broadcast_run(run_id, {"log": f"[error] {framework}: {exc}"})
-            logger.warning("engine: subprocess error for %s: %s", framework, exc)
-            continue
-        finally:
-            _running_processes.pop(run_id, None)
+                returncode = proc.returncode or 0
+                stdout_text = "\n".join(stdout_lines)
+                stderr_text = "\n".join(stderr_lines)
 
-        logger.debug("engine [%s] exit=%s stdout=%s stderr=%s", framework, returncode, stdout_text[:300], stderr_text[:300])
+            except Exception as exc:
+                await _broadcast_run(run_id, {"log": f"[error] {framework}: {exc}"})
+                logger.warning("engine: subprocess error for %s: %s", framework, exc)
+                continue
+            finally:
+                _running_processes.pop(run_id, None)
+                log_q.put_nowait(None)
+                await drainer
 
-        # ── Parse results per runner framework ─────────────────────────────
-        runner_parsed: list[dict[str, Any]] = []
+            logger.debug("engine [%s] exit=%s stdout=%s stderr=%s", framework, returncode, stdout_text[:300], stderr_text[:300])
 
-        if framework == "playwright":
-            runner_parsed = _parse_playwright_output(stdout_text)
-        elif framework == "pytest":
-            for rname in (report_name, ".testforge_report.json", ".report.json", "report.json"):
-                report_file = Path(run_cwd) / rname
-                if report_file.exists():
-                    try:
-                        runner_parsed = _parse_pytest_output(report_file.read_text(encoding="utf-8"))
-                        report_file.unlink(missing_ok=True)
-                        if runner_parsed:
-                            break
-                    except OSError:
-                        pass
-            if not runner_parsed and stdout_text.strip():
-                runner_parsed = _parse_pytest_output(stdout_text)
-        elif framework == "go-test":
-            runner_parsed = _parse_go_test_output(stdout_text)
-        elif framework in ("jest", "vitest"):
-            runner_parsed = _parse_jest_vitest_output(stdout_text, framework=framework)
-
-        # Inject language/framework for results that don't have them
-        for r in runner_parsed:
-            r.setdefault("test_language", language)
-            r.setdefault("test_framework", framework)
-
-        # Fallback: if parsing failed, create a single result
-        if not runner_parsed:
-            status = TestResultStatus.PASSED if returncode == 0 else TestResultStatus.FAILED
-            error_snippet = (stderr_text or stdout_text)[:500].strip()
-            if returncode != 0 and error_snippet:
-                await _broadcast_run(run_id, {"log": f"[test] {framework} exit {returncode}: {error_snippet[:300]}"})
-            runner_parsed = [
-                {
-                    "test_name": f"{framework} run",
-                    "test_file": None,
-                    "test_suite": None,
-                    "test_layer": layer,
-                    "status": status,
-                    "duration_ms": None,
-                    "error_message": error_snippet or None,
-                    "error_stack": (stderr_text or stdout_text) or None,
-                    "test_language": language,
-                    "test_framework": framework,
-                    "error_category": categorize_error(error_snippet, stderr_text),
-                }
-            ]
-        else:
-            n_pass = sum(1 for r in runner_parsed if r["status"] == TestResultStatus.PASSED)
-            n_fail = sum(1 for r in runner_parsed if r["status"] == TestResultStatus.FAILED)
-            n_skip = sum(1 for r in runner_parsed if r["status"] == TestResultStatus.SKIPPED)
-            await _broadcast_run(run_id, {
-                "log": f"[{framework}] {len(runner_parsed)} collected — ✓{n_pass} ✗{n_fail} ↷{n_skip}"
-            })
-            for r in runner_parsed:
-                if r["status"] == TestResultStatus.FAILED and r.get("error_message"):
-                    await _broadcast_run(run_id, {
-                        "log": f"[fail] {r['test_name']}: {str(r['error_message'])[:200]}"
-                    })
-                    break
+            # ── Parse results per runner framework ─────────────────────────────
+            runner_parsed = await asyncio.to_thread(
+                _parse_runner_results, framework, run_cwd, report_name, stdout_text, fresh_after_ns,
+            )
 
-        parsed.extend(runner_parsed)
+            # Inject language/framework for results that don't have them
+            for r in runner_parsed:
+                r.setdefault("test_language", language)
+                r.setdefault("test_framework", framework)
+
+            # Fallback: if parsing failed, create a single result
+            if not runner_parsed:
+                status = TestResultStatus.PASSED if returncode == 0 else TestResultStatus.FAILED
+                error_snippet = (stderr_text or stdout_text)[:500].strip()
+                if returncode != 0 and error_snippet:
+                    await _broadcast_run(run_id, {"log": f"[test] {framework} exit {returncode}: {error_snippet[:300]}"})
+                runner_parsed = [
+                    {
+                        "test_name": f"{framework} run",
+                        "test_file": None,
+                        "test_suite": None,
+                        "test_layer": layer,
+                        "status": status,
+                        "duration_ms": None,
+                        "error_message": error_snippet or None,
+                        "error_stack": (stderr_text or stdout_text) or None,
+                        "test_language": language,
+                        "test_framework": framework,
+                        "error_category": categorize_error(error_snippet, stderr_text),
+                    }
+                ]
+            else:
+                by_status = Counter(r["status"] for r in runner_parsed)
+                n_pass = by_status[TestResultStatus.PASSED]
+                n_fail = by_status[TestResultStatus.FAILED]
+                n_skip = by_status[TestResultStatus.SKIPPED]
+                await _broadcast_run(run_id, {
+                    "log": f"[{framework}] {len(runner_parsed)} collected — ✓{n_pass} ✗{n_fail} ↷{n_skip}"
+                })
+                for r in runner_parsed:
+                    if r["status"] == TestResultStatus.FAILED and r.get("error_message"):
+                        await _broadcast_run(run_id, {
+                            "log": f"[fail] {r['test_name']}: {str(r['error_message'])[:200]}"
+                        })
+                        break
+
+            parsed.extend(runner_parsed)
+            # Insert this runner's rows while the next runner executes.  The session
+            # is otherwise idle in this loop, so at most one statement is in flight.
+            if persist is not None:
+                await persist
+            persist = asyncio.create_task(
+                db.execute(insert(TestResult), _result_rows(run_id, runner_parsed, primary_layer))
+            )
+    except BaseException:
+        # Don't leave an INSERT running on a session this coroutine is abandoning
+        if persist is not None:
+            persist.cancel()
+        raise
+    if persist is not None:
+        await persist
 
     # ── Merge TypeScript/E2E skipped tests into results ──────────────────────
     if ts_skipped:
@@ -1937,60 +2794,64 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
 
     # If no runners produced results (all skipped/failed to start)
     if not parsed and not ts_skipped:
-        test_run.status = TestRunStatus.FAILED
-        test_run.error_message = "No test runners could execute. Check that test frameworks are installed."
-        test_run.completed_at = datetime.now(timezone.utc)
-        await db.commit()
-        await _broadcast_run(run_id, {"status": "failed", "error_message": test_run.error_message})
+        await _finalize_failed(
+            db, run_id, "No test runners could execute. Check that test frameworks are installed.",
+        )
         return
 
     # ── Persist TestResult rows ───────────────────────────────────────────────
-    for r in parsed:
-        db.add(
-            TestResult(
-                id=str(uuid4()),
-                test_run_id=run_id,
-                test_name=r["test_name"],
-                test_file=r.get("test_file"),
-                test_suite=r.get("test_suite"),
-                test_layer=r.get("test_layer", primary_layer),
-                status=r["status"],
-                duration_ms=r.get("duration_ms"),
-                error_message=r.get("error_message"),
-                error_stack=r.get("error_stack"),
-                screenshot_path=r.get("screenshot_path"),
-                extra_data=r.get("extra_data"),
-                test_language=r.get("test_language"),
-                test_framework=r.get("test_framework"),
-                error_category=r.get("error_category"),
-            )
-        )
-
-    # ── Re-check run status (may have been cancelled while subprocess ran) ───
-    await db.refresh(test_run)
-    if test_run.status == TestRunStatus.CANCELLED:
-        logger.info("engine: run %s was cancelled while executing", run_id)
-        await _broadcast_run(run_id, {"status": "cancelled", "progress": 100})
-        return
+    # Runner results were inserted as each runner finished; the skipped
+    # TypeScript entries follow in the same transaction as the run summary.
+    if ts_skipped:
+        await db.execute(insert(TestResult), _result_rows(run_id, ts_skipped, primary_layer))
 
     # ── Update run summary ────────────────────────────────────────────────────
     completed = datetime.now(timezone.utc)
-    passed = sum(1 for r in parsed if r["status"] == TestResultStatus.PASSED)
-    failed = sum(1 for r in parsed if r["status"] == TestResultStatus.FAILED)
-    skipped = sum(1 for r in parsed if r["status"] == TestResultStatus.SKIPPED)
+    by_status = Counter(r["status"] for r in parsed)
+    passed = by_status[TestResultStatus.PASSED]
+    failed = by_status[TestResultStatus.FAILED]
+    skipped = by_status[TestResultStatus.SKIPPED]
     total = len(parsed)
 
-    test_run.total_tests = total
-    test_run.passed_tests = passed
-    test_run.failed_tests = failed
-    test_run.skipped_tests = skipped
-    test_run.completed_at = completed
-    test_run.duration_ms = int((completed - started).total_seconds() * 1000)
-    test_run.status = TestRunStatus.PASSED if failed == 0 else TestRunStatus.FAILED
+    duration_ms = (time.monotonic_ns() - started_mono) // 1_000_000
+    final_status = TestRunStatus.PASSED if failed == 0 else TestRunStatus.FAILED
+
+    # Same transaction as the results INSERT above: one commit finalizes the run.
+    # The status guard doubles as the cancellation check (the run may have been
+    # cancelled while the subprocess ran): no row back means it was, atomically,
+    # without a separate SELECT first.
+    updated = await db.scalar(
+        update(TestRun)
+        .where(TestRun.id == run_id, TestRun.status != TestRunStatus.CANCELLED)
+        .values(
+            total_tests=total,
+            passed_tests=passed,
+            failed_tests=failed,
+            skipped_tests=skipped,
+            completed_at=completed,
+            duration_ms=duration_ms,
+            status=final_status,
+        )
+        .returning(TestRun.id)
+    )
+    if updated is None:
+        # Nothing is committed; the results inserted above roll back with the session.
+        logger.info("engine: run %s was cancelled while executing", run_id)
+        await _broadcast_run(run_id, {"status": "cancelled", "progress": 100})
+        return
 
-    await db.commit()
+    # Once the commit starts, let it finish even if this task is cancelled, so
+    # the results and the summary land together or not at all.  The commit is
+    # awaited again before re-raising: the caller closes this session on the
+    # way out, which must not happen while the commit is still using it.
+    commit = asyncio.ensure_future(db.commit())
+    try:
+        await asyncio.shield(commit)
+    except asyncio.CancelledError:
+        await commit
+        raise
     await _broadcast_run(run_id, {
-        "status": test_run.status.value if hasattr(test_run.status, "value") else test_run.status,
+        "status": final_status.value,
         "progress": 100,
         "total_tests": total,
         "passed_tests": passed,
@@ -2002,5 +2863,5 @@ async def _execute(db: AsyncSession, project_id: str, run_id: str) -> None:
         run_id,
         passed,
         total,
-        test_run.duration_ms,
+        duration_ms,
     )
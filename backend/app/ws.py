@@ -10,6 +10,17 @@ from fastapi import WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
+# Every log batch and progress update is serialized here; orjson encodes
+# several times faster than stdlib json.  Frames stay text (the frontend
+# JSON.parses event.data), so its bytes are decoded once per message.
+try:
+    import orjson
+
+    def _dumps(data: dict[str, Any]) -> str:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    _dumps = json.dumps
+
 
 class ConnectionManager:
     """Manages WebSocket connections grouped by job_type and job_id."""
@@ -40,7 +51,7 @@ class ConnectionManager:
         conns = self._connections.get(key)
         if not conns:
             return
-        message = json.dumps(data)
+        message = _dumps(data)
         dead: list[WebSocket] = []
         for ws in conns:
             try:
@@ -0,0 +1,862 @@
+"""Unit tests for the test execution engine helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+from app.core import engine
+from app.models.test_run import TestResultStatus as ResultStatus
+
+# ── Install command streaming ─────────────────────────────────────────────────
+
+
+class TestStreamInstallCmd:
+    async def test_success_returns_true(self):
+        ok, _ = await engine._stream_install_cmd(
+            [sys.executable, "-c", "print('hello')"], None, "echo"
+        )
+        assert ok is True
+
+    async def test_failure_keeps_only_stderr_tail(self):
+        script = (
+            "import sys\n"
+            "for i in range(500):\n"
+            "    print(f'err {i}', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        ok, stderr_text = await engine._stream_install_cmd(
+            [sys.executable, "-c", script], None, "noisy"
+        )
+        assert ok is False
+        lines = stderr_text.splitlines()
+        assert len(lines) == 32
+        assert lines[-1] == "err 499"
+
+    async def test_stdin_data_is_piped_to_command(self):
+        script = "import sys; sys.exit(0 if sys.stdin.read() == 'a==1\\nb\\n' else 5)"
+        ok, _ = await engine._stream_install_cmd(
+            [sys.executable, "-c", script], None, "stdin", stdin_data=b"a==1\nb\n"
+        )
+        assert ok is True
+
+    async def test_output_broadcast_in_order_before_status(self, monkeypatch):
+        sent: list[dict] = []
+
+        async def _record(run_id, data):
+            sent.append(data)
+
+        monkeypatch.setattr(engine, "_broadcast_run", _record)
+        ok, _ = await engine._stream_install_cmd(
+            [sys.executable, "-c", "print('a'); print(); print('b')"], "run-1", "echo"
+        )
+        assert ok is True
+        lines = [line for msg in sent for line in msg.get("logs", [])]
+        assert lines == ["  a", "  b"]
+        assert sent[0] == {"log": "[install] echo"}
+        assert sent[-1] == {"log": "[install] ✓ Done"}
+
+    async def test_timeout_kills_command(self):
+        ok, msg = await engine._stream_install_cmd(
+            [sys.executable, "-c", "import time; time.sleep(30)"], None, "slow", timeout=0.5
+        )
+        assert ok is False
+        assert msg == "Timed out"
+
+
+class TestBroadcastDrainer:
+    async def test_coalesces_queued_lines(self, monkeypatch):
+        sent: list[dict] = []
+
+        async def _record(run_id, data):
+            sent.append(data)
+
+        monkeypatch.setattr(engine, "_broadcast_run", _record)
+        monkeypatch.setattr(engine, "_LOG_BATCH_MAX", 3)
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(5):
+            queue.put_nowait(f"line {i}")
+        queue.put_nowait(None)
+        await engine._broadcast_drainer("run-1", queue)
+        assert sent == [{"logs": ["line 0", "line 1", "line 2"]}, {"logs": ["line 3", "line 4"]}]
+
+    async def test_stops_on_sentinel_without_broadcast(self, monkeypatch):
+        broadcast = AsyncMock()
+        monkeypatch.setattr(engine, "_broadcast_run", broadcast)
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait(None)
+        await engine._broadcast_drainer("run-1", queue)
+        broadcast.assert_not_called()
+
+
+class TestStreamToLogs:
+    async def test_splits_chunks_into_lines(self):
+        stream = asyncio.StreamReader()
+        euro = "€".encode()
+        stream.feed_data(b"first\nsec")
+        stream.feed_data(b"ond " + euro[:1])
+        stream.feed_data(euro[1:] + b"\n\n  \nlast")
+        stream.feed_eof()
+        buf: deque[str] = deque()
+        queue: asyncio.Queue = asyncio.Queue()
+        await engine._stream_to_logs(stream, buf, queue)
+        assert list(buf) == ["first", "second €", "", "", "last"]
+        queued = [queue.get_nowait() for _ in range(queue.qsize())]
+        assert queued == ["[test] first", "[test] second €", "[test] last"]
+
+    async def test_truncated_character_at_eof_is_replaced(self):
+        stream = asyncio.StreamReader()
+        stream.feed_data(b"ok\ntail " + "€".encode()[:2])
+        stream.feed_eof()
+        buf: deque[str] = deque()
+        await engine._stream_to_logs(stream, buf, asyncio.Queue())
+        assert list(buf) == ["ok", "tail \ufffd"]
+
+
+# ── pytest JSON report parsing ────────────────────────────────────────────────
+
+
+def _pytest_report(*tests: dict) -> dict:
+    return {"created": 0, "duration": 1.0, "tests": list(tests)}
+
+
+class TestParsePytestOutput:
+    def test_parses_report_bytes(self):
+        raw = json.dumps(
+            _pytest_report(
+                {"nodeid": "tests/test_a.py::TestCls::test_ok", "outcome": "passed", "duration": 0.25},
+                {"nodeid": "tests/test_a.py::test_bad", "outcome": "failed", "longrepr": "boom"},
+            )
+        ).encode()
+        results = engine._parse_pytest_output(raw)
+        assert [r["test_name"] for r in results] == ["test_ok", "test_bad"]
+        assert results[0]["test_suite"] == "TestCls"
+        assert results[0]["test_file"] == "tests/test_a.py"
+        assert results[0]["duration_ms"] == 250
+        assert results[1]["status"] == ResultStatus.FAILED
+        assert results[1]["error_message"] == "boom"
+        assert results[1]["test_suite"] is None
+
+    def test_splits_nodeid_segments(self):
+        raw = json.dumps(
+            _pytest_report(
+                {"nodeid": "t.py::Outer::Inner::test_x[a-b]", "outcome": "passed"},
+                {"nodeid": "t.py", "outcome": "error"},
+            )
+        )
+        nested, bare = engine._parse_pytest_output(raw)
+        assert (nested["test_file"], nested["test_suite"], nested["test_name"]) == (
+            "t.py", "Outer", "test_x[a-b]",
+        )
+        assert (bare["test_file"], bare["test_suite"], bare["test_name"]) == ("t.py", None, "t.py")
+
+    def test_e2e_layer_from_posix_and_windows_paths(self):
+        raw = json.dumps(
+            _pytest_report(
+                {"nodeid": "tests/testforge/e2e/test_a.py::test_x", "outcome": "passed"},
+                {"nodeid": "tests\\testforge\\e2e\\test_b.py::test_y", "outcome": "passed"},
+                {"nodeid": "tests/testforge/test_c.py::test_z", "outcome": "passed"},
+            )
+        )
+        assert [r["test_layer"] for r in engine._parse_pytest_output(raw)] == ["frontend", "frontend", "backend"]
+
+    def test_report_parser_takes_decoded_document(self):
+        report = _pytest_report({"nodeid": "t.py::test_x", "outcome": "passed", "duration": 0.5})
+        [result] = engine._parse_pytest_report(report)
+        assert result["test_name"] == "test_x"
+        assert result["duration_ms"] == 500
+
+    def test_accepts_str_input(self):
+        report = json.dumps(_pytest_report({"nodeid": "t.py::test_x", "outcome": "skipped"}))
+        results = engine._parse_pytest_output(report)
+        assert len(results) == 1
+        assert results[0]["status"] == ResultStatus.SKIPPED
+
+    def test_reads_screenshot_and_network_sentinels(self, tmp_path):
+        net_file = tmp_path / "tf_test_x.json"
+        net_file.write_text(json.dumps([{"url": "http://x/", "method": "GET"}]))
+        stdout = (
+            "some output\n"
+            "[testforge:network]" + str(net_file) + "\n"
+            "more output\n"
+            "[testforge:screenshot]/app/screenshots/tf_test_x.png"
+        )
+        raw = json.dumps(
+            _pytest_report({"nodeid": "t.py::test_x", "outcome": "failed", "call": {"stdout": stdout}})
+        ).encode()
+        [result] = engine._parse_pytest_output(raw)
+        assert result["screenshot_path"] == "/app/screenshots/tf_test_x.png"
+        assert result["extra_data"] == {"network_requests": [{"url": "http://x/", "method": "GET"}]}
+
+    def test_ignores_sentinel_prefix_mid_line(self):
+        stdout = "log: [testforge:screenshot]/not/a/sentinel.png\n"
+        raw = json.dumps(
+            _pytest_report({"nodeid": "t.py::test_x", "outcome": "passed", "call": {"stdout": stdout}})
+        ).encode()
+        [result] = engine._parse_pytest_output(raw)
+        assert result["screenshot_path"] is None
+
+    def test_garbage_returns_empty(self):
+        assert engine._parse_pytest_output(b"not json at all") == []
+
+
+class TestParseRunnerResults:
+    def test_reads_fresh_report_and_ignores_stale_ones(self, tmp_path):
+        report = _pytest_report({"nodeid": "t.py::test_ok", "outcome": "passed"})
+        stale = tmp_path / "report.json"
+        stale.write_text(json.dumps(report))
+        engine.os.utime(stale, ns=(0, 0))
+        fresh_after = time.time_ns() - 1_000_000_000
+
+        assert engine._parse_runner_results("pytest", str(tmp_path), ".r0.json", "", fresh_after) == []
+        assert stale.exists()
+
+        (tmp_path / ".r0.json").write_text(json.dumps(report))
+        parsed = engine._parse_runner_results("pytest", str(tmp_path), ".r0.json", "", fresh_after)
+        assert [r["test_name"] for r in parsed] == ["test_ok"]
+        assert not (tmp_path / ".r0.json").exists()
+
+
+# ── Other framework parsers ───────────────────────────────────────────────────
+
+
+class TestParseOtherFrameworks:
+    def test_go_test_ndjson(self):
+        raw = "\n".join(
+            json.dumps(e)
+            for e in (
+                {"Action": "output", "Package": "pkg", "Test": "TestA", "Output": "oops\n"},
+                {"Action": "fail", "Package": "pkg", "Test": "TestA", "Elapsed": 0.5},
+                {"Action": "pass", "Package": "pkg", "Test": "TestB", "Elapsed": 0},
+            )
+        ) + "\nnot-json\n"
+        results = engine._parse_go_test_output(raw)
+        assert [(r["test_name"], r["status"]) for r in results] == [
+            ("TestA", ResultStatus.FAILED),
+            ("TestB", ResultStatus.PASSED),
+        ]
+        assert results[0]["error_message"] == "oops\n"
+        assert results[0]["duration_ms"] == 500
+
+    def test_jest_json(self):
+        raw = json.dumps({
+            "testResults": [{
+                "name": "src/a.test.tsx",
+                "assertionResults": [
+                    {"title": "renders", "ancestorTitles": ["App"], "status": "passed", "duration": 3},
+                    {"title": "todo", "ancestorTitles": [], "status": "todo"},
+                ],
+            }]
+        })
+        results = engine._parse_jest_vitest_output(raw, framework="vitest")
+        assert results[0]["test_suite"] == "App"
+        assert results[0]["test_layer"] == "frontend"
+        assert results[0]["test_language"] == "typescript"
+        assert results[1]["status"] == ResultStatus.SKIPPED
+
+
+# ── Workspace test files ──────────────────────────────────────────────────────
+
+
+class TestClearGeneratedTests:
+    def test_removes_only_generated_test_files(self, tmp_path):
+        (tmp_path / "test_a.py").write_text("")
+        (tmp_path / "conftest.py").write_text("")
+        (tmp_path / "helper.py").write_text("")
+        assert engine._clear_generated_tests(tmp_path) is False
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["conftest.py", "helper.py"]
+
+    def test_reports_existing_init(self, tmp_path):
+        (tmp_path / "__init__.py").write_text("")
+        assert engine._clear_generated_tests(tmp_path) is True
+
+    def test_keeps_named_files(self, tmp_path):
+        (tmp_path / "test_a.py").write_text("")
+        (tmp_path / "test_b.py").write_text("")
+        engine._clear_generated_tests(tmp_path, keep={"test_b.py"})
+        assert [p.name for p in tmp_path.iterdir()] == ["test_b.py"]
+
+
+class TestWriteIfChanged:
+    def test_skips_identical_content(self, tmp_path):
+        path = tmp_path / "conftest.py"
+        assert engine._write_if_changed(path, b"same") is True
+        assert engine._write_if_changed(path, b"same") is False
+        assert engine._write_if_changed(path, b"diff") is True
+        assert path.read_bytes() == b"diff"
+
+
+class TestSyntaxError:
+    def test_valid_code(self):
+        assert engine._syntax_error("def test_ok():\n    assert True\n") is None
+
+    def test_invalid_code_is_reported_and_cached(self):
+        code = "def test_home.spec():\n    pass\n"
+        first = engine._syntax_error(code)
+        assert first is not None
+        assert engine._syntax_error(code) == first
+
+
+
+def _accepted_test(name: str, code: str, test_type: str = "api", entry_point: str | None = None):
+    return SimpleNamespace(
+        id="0123456789abcdef", test_name=name, entry_point=entry_point,
+        test_type=test_type, test_code=code,
+    )
+
+
+def _db_returning(rows: list) -> AsyncMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+class TestWriteAcceptedTests:
+    async def test_writes_converts_and_skips(self, tmp_path):
+        db = _db_returning([
+            _accepted_test("Health check", "def test_health():\n    assert True"),
+            _accepted_test("Bad name", "def test_home.spec():\n    pass"),
+            _accepted_test("Home page", "import { test } from '@playwright/test'", "e2e", "src/pages/Home.tsx"),
+            _accepted_test("Api ts", "import { request } from '@playwright/test'", "api"),
+        ])
+        written, ts_skipped, skipped_syntax, e2e_written = await engine._write_accepted_tests_to_workspace(
+            db, "proj", str(tmp_path), "run"
+        )
+        assert (written, len(ts_skipped), skipped_syntax, e2e_written) == (2, 1, 1, 1)
+        tf_dir = tmp_path / "tests" / "testforge"
+        assert (tf_dir / "test_health_check_01234567.py").read_text().startswith("def test_health")
+        e2e_files = sorted(p.name for p in (tf_dir / "e2e").glob("test_*.py"))
+        assert e2e_files == ["test_home_page_01234567.py"]
+        assert (tf_dir / "e2e" / "conftest.py").read_bytes() == engine._E2E_CONFTEST_SRC
+        assert (tf_dir / "__init__.py").exists()
+
+    async def test_rerun_keeps_unchanged_and_drops_stale_files(self, tmp_path):
+        tf_dir = tmp_path / "tests" / "testforge"
+        health = _accepted_test("Health check", "def test_health():\n    assert True")
+        await engine._write_accepted_tests_to_workspace(_db_returning([health]), "proj", str(tmp_path), "run")
+        kept = tf_dir / "test_health_check_01234567.py"
+        stale = tf_dir / "test_removed_01234567.py"
+        stale.write_text("def test_gone():\n    pass\n")
+        mtime = kept.stat().st_mtime_ns
+
+        written, _, _, _ = await engine._write_accepted_tests_to_workspace(
+            _db_returning([health]), "proj", str(tmp_path), "run"
+        )
+        assert written == 1
+        assert kept.stat().st_mtime_ns == mtime
+        assert not stale.exists()
+        assert sorted(p.name for p in tf_dir.iterdir() if p.is_file()) == [
+            "__init__.py", "test_health_check_01234567.py",
+        ]
+
+    async def test_no_accepted_tests(self, tmp_path):
+        result = await engine._write_accepted_tests_to_workspace(
+            _db_returning([]), "proj", str(tmp_path), "run"
+        )
+        assert result == (0, [], 0, 0)
+
+
+
+# ── Auth token probing ────────────────────────────────────────────────────────
+
+
+def _patch_httpx(monkeypatch, handler) -> None:
+    real_client = httpx.AsyncClient
+
+    def _client(*args, **kwargs):
+        return real_client(*args, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", _client)
+
+
+class TestTryGetAuthToken:
+    async def test_returns_token_from_matching_endpoint(self, monkeypatch):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/auth/token":
+                return httpx.Response(200, json={"data": {"access_token": "tok"}})
+            return httpx.Response(404)
+
+        _patch_httpx(monkeypatch, handler)
+        assert await engine._try_get_auth_token("http://api/", "a@b.c", "pw") == "tok"
+
+    async def test_returns_none_when_all_fail(self, monkeypatch):
+        _patch_httpx(monkeypatch, lambda request: httpx.Response(401))
+        assert await engine._try_get_auth_token("http://api", "a@b.c", "pw") is None
+
+
+
+class TestAuthTokenCache:
+    @staticmethod
+    def _jwt(exp: float) -> str:
+        claims = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+        return f"hdr.{claims}.sig"
+
+    def test_ttl_from_exp_claim(self):
+        assert 590 < engine._token_ttl(self._jwt(time.time() + 600)) <= 600
+
+    def test_ttl_default_for_opaque_token(self):
+        assert engine._token_ttl("opaque") == engine._AUTH_TOKEN_DEFAULT_TTL
+
+    async def test_reuses_valid_token(self, monkeypatch):
+        login = AsyncMock(return_value=self._jwt(time.time() + 3600))
+        monkeypatch.setattr(engine, "_try_get_auth_token", login)
+        monkeypatch.setattr(engine, "_AUTH_TOKEN_CACHE", {})
+        first = await engine._get_auth_token_cached("http://api", "a@b.c", "pw")
+        second = await engine._get_auth_token_cached("http://api", "a@b.c", "pw")
+        assert first == second
+        assert login.await_count == 1
+
+    async def test_refreshes_expiring_token(self, monkeypatch):
+        login = AsyncMock(return_value=self._jwt(time.time() + 10))
+        monkeypatch.setattr(engine, "_try_get_auth_token", login)
+        monkeypatch.setattr(engine, "_AUTH_TOKEN_CACHE", {})
+        await engine._get_auth_token_cached("http://api", "a@b.c", "pw")
+        await engine._get_auth_token_cached("http://api", "a@b.c", "pw")
+        assert login.await_count == 2
+
+    def test_decrypt_cached(self, monkeypatch):
+        from app.core.security import encryption
+
+        engine._decrypt_cached.cache_clear()
+        ciphertext = encryption.encrypt_value("s3cret")
+        decrypt = MagicMock(side_effect=encryption.decrypt_value)
+        monkeypatch.setattr(engine, "decrypt_value", decrypt)
+        assert engine._decrypt_cached(ciphertext) == "s3cret"
+        assert engine._decrypt_cached(ciphertext) == "s3cret"
+        assert decrypt.call_count == 1
+        engine._decrypt_cached.cache_clear()
+
+
+# ── .env parsing ──────────────────────────────────────────────────────────────
+
+
+class TestParseDotenv:
+    def test_parses_keys_values_and_quotes(self):
+        text = (
+            "# comment\n"
+            "\n"
+            "FOO=bar\n"
+            "  SPACED = value with spaces  \n"
+            'QUOTED="http://localhost:8000"\n'
+            "SINGLE='x'\n"
+            "HASH=abc#def\n"
+            "EMPTY=\n"
+            "no_equals_line\n"
+            "WINDOWS=crlf\r\n"
+            "=orphan\n"
+        )
+        assert engine._parse_dotenv(text) == [
+            ("FOO", "bar"),
+            ("SPACED", "value with spaces"),
+            ("QUOTED", "http://localhost:8000"),
+            ("SINGLE", "x"),
+            ("HASH", "abc#def"),
+            ("EMPTY", ""),
+            ("WINDOWS", "crlf"),
+        ]
+
+    def test_load_cached_until_file_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine, "_DOTENV_CACHE", {})
+        parse = MagicMock(side_effect=engine._parse_dotenv)
+        monkeypatch.setattr(engine, "_parse_dotenv", parse)
+        env = tmp_path / ".env"
+        assert engine._load_dotenv_cached(env) is None
+        env.write_text("A=1\n")
+        assert engine._load_dotenv_cached(env) == [("A", "1")]
+        assert engine._load_dotenv_cached(env) == [("A", "1")]
+        assert parse.call_count == 1
+        env.write_text("A=1\nB=2\n")
+        assert engine._load_dotenv_cached(env) == [("A", "1"), ("B", "2")]
+        assert parse.call_count == 2
+
+
+class TestFrontendReachable:
+    async def test_listening_port_is_reachable(self):
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            assert await engine._frontend_reachable(f"http://127.0.0.1:{port}") is True
+
+    async def test_closed_port_is_unreachable(self):
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        assert await engine._frontend_reachable(f"http://127.0.0.1:{port}", timeout=1) is False
+
+    def test_conftest_honours_engine_probe(self, monkeypatch):
+        namespace: dict = {}
+        monkeypatch.setenv("TESTFORGE_FRONTEND_UP", "1")
+        monkeypatch.setenv("FRONTEND_URL", "http://unreachable.invalid:1")
+        src = engine._E2E_CONFTEST_SRC.decode()
+        exec(compile(src.replace("SCREENSHOT_DIR.mkdir", "(lambda **_: None)").replace(
+            "NETWORK_DIR.mkdir", "(lambda **_: None)"), "conftest", "exec"), namespace)
+        assert namespace["_check_frontend_tcp"]() is True
+
+
+class TestResultRows:
+    def test_rows_get_distinct_v4_ids_and_default_layer(self):
+        results = [
+            {"test_name": "a", "status": ResultStatus.PASSED},
+            {"test_name": "b", "status": ResultStatus.FAILED, "test_layer": "frontend"},
+        ]
+        rows = engine._result_rows("run-1", results, "backend")
+        ids = [engine.UUID(row["id"]) for row in rows]
+        assert len(set(ids)) == 2 and all(u.version == 4 for u in ids)
+        assert all(len(row["id"]) == 36 for row in rows)
+        assert [row["test_layer"] for row in rows] == ["backend", "frontend"]
+        assert rows[0]["test_run_id"] == "run-1"
+        assert engine._result_rows("run-1", [], "backend") == []
+
+
+class TestFinalizeFailed:
+    async def test_updates_commits_and_broadcasts(self, monkeypatch):
+        broadcast = AsyncMock()
+        monkeypatch.setattr(engine, "_broadcast_run", broadcast)
+        db = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+        await engine._finalize_failed(db, "run-1", "boom")
+        [stmt] = db.execute.await_args.args
+        params = stmt.compile().params
+        assert params["status"] == engine.TestRunStatus.FAILED
+        assert params["error_message"] == "boom"
+        db.commit.assert_awaited_once()
+        broadcast.assert_awaited_once_with("run-1", {"status": "failed", "error_message": "boom"})
+
+
+class TestWidenOutputPipes:
+    async def test_grows_pipe_buffers_on_linux(self):
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", "import time; time.sleep(0.2)",
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            engine._widen_output_pipes(proc)
+            if sys.platform.startswith("linux"):
+                import fcntl
+
+                pipe = proc._transport.get_pipe_transport(1).get_extra_info("pipe")
+                assert fcntl.fcntl(pipe.fileno(), getattr(fcntl, "F_GETPIPE_SZ", 1032)) >= 1 << 20
+        finally:
+            await proc.communicate()
+
+
+class TestInjectTestforgeConftest:
+    def test_skips_untouched_workspace(self, tmp_path, monkeypatch):
+        run_cwd = str(tmp_path)
+        engine._inject_testforge_conftest(run_cwd)
+        assert (tmp_path / "conftest.py").read_bytes() == engine._ROOT_CONFTEST_SRC
+
+        write = MagicMock(wraps=engine._write_testforge_conftest)
+        monkeypatch.setattr(engine, "_write_testforge_conftest", write)
+        engine._inject_testforge_conftest(run_cwd)
+        write.assert_not_called()
+
+        (tmp_path / "conftest.py").write_text("import pytest\n")
+        engine._inject_testforge_conftest(run_cwd)
+        write.assert_called_once_with(run_cwd)
+        assert (tmp_path / "conftest_testforge.py").read_bytes() == engine._ROOT_CONFTEST_SRC
+
+
+class TestRunSlots:
+    async def test_rejects_run_when_saturated(self, monkeypatch):
+        monkeypatch.setattr(engine, "_run_slots", asyncio.Semaphore(1))
+        finalize = AsyncMock()
+        execute = AsyncMock()
+        monkeypatch.setattr(engine, "_finalize_failed", finalize)
+        monkeypatch.setattr(engine, "_execute", execute)
+        monkeypatch.setattr(engine, "async_session_factory", MagicMock(return_value=AsyncMock()))
+
+        async with engine._run_slots:
+            await engine.run_tests_for_project("proj", "run-busy")
+        execute.assert_not_called()
+        assert finalize.await_args.args[1] == "run-busy"
+
+        await engine.run_tests_for_project("proj", "run-ok")
+        execute.assert_awaited_once()
+        assert not engine._run_slots.locked()
+
+
+def _stub_execute(monkeypatch, cwd, framework="go-test", commit=None) -> AsyncMock:
+    """Session mock + patched engine seams for driving ``_execute`` end to end.
+
+    The single runner is a real ``python -c`` process whose (unparseable)
+    output yields the fallback result, so only the engine's own plumbing runs.
+    """
+    project = SimpleNamespace(id="proj", path=str(cwd))
+    test_run = SimpleNamespace(status=None, started_at=None)
+    row = MagicMock()
+    row.first.return_value = (project, None, test_run)
+    db = AsyncMock()
+    db.execute.side_effect = [row] + [MagicMock()] * 4
+    db.scalar.return_value = "run"
+    if commit is not None:
+        db.commit.side_effect = commit
+    monkeypatch.setattr(engine, "_broadcast_run", AsyncMock())
+    monkeypatch.setattr(engine, "_inject_testforge_conftest", MagicMock())
+    monkeypatch.setattr(engine, "_detect_all_runners", MagicMock(return_value=[{
+        "layer": "backend",
+        "cmd": [sys.executable, "-c", "print('ok')"],
+        "cwd": str(cwd),
+        "language": "python",
+        "framework": framework,
+    }]))
+    return db
+
+
+class TestExecute:
+    async def test_cancel_during_commit_waits_before_close(self, tmp_path, monkeypatch):
+        events: list[str] = []
+        in_commit = asyncio.Event()
+
+        async def commit():
+            if db.commit.await_count == 1:
+                return  # the early RUNNING status commit
+            in_commit.set()
+            await asyncio.sleep(0.05)
+            events.append("commit")
+
+        db = _stub_execute(monkeypatch, tmp_path, commit=commit)
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(side_effect=lambda *exc: events.append("close"))
+        monkeypatch.setattr(engine, "async_session_factory", MagicMock(return_value=session))
+
+        task = asyncio.create_task(engine.run_tests_for_project("proj", "run"))
+        await in_commit.wait()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        else:
+            raise AssertionError("cancellation was swallowed")
+        assert events == ["commit", "close"]
+
+    async def _run_workspace(self, tmp_path, monkeypatch, e2e_written: int) -> AsyncMock:
+        monkeypatch.chdir(tmp_path)
+        ws = tmp_path / "workspace" / "proj"
+        ws.mkdir(parents=True)
+        (ws / "tests").mkdir()
+        (ws / ".env").write_text("FRONTEND_URL=http://10.255.255.1:3000\n")
+        db = _stub_execute(monkeypatch, ws, framework="pytest")
+        monkeypatch.setattr(engine, "_ensure_project_venv", AsyncMock(return_value=None))
+        monkeypatch.setattr(
+            engine, "_write_accepted_tests_to_workspace",
+            AsyncMock(return_value=(1, [], 0, e2e_written)),
+        )
+        probe = AsyncMock(return_value=True)
+        monkeypatch.setattr(engine, "_frontend_reachable", probe)
+        await engine._execute(db, "proj", "run")
+        return probe
+
+    async def test_no_e2e_tests_skips_frontend_probe(self, tmp_path, monkeypatch):
+        probe = await self._run_workspace(tmp_path, monkeypatch, e2e_written=0)
+        probe.assert_not_called()
+
+    async def test_e2e_tests_probe_frontend(self, tmp_path, monkeypatch):
+        probe = await self._run_workspace(tmp_path, monkeypatch, e2e_written=1)
+        probe.assert_awaited_once_with("http://10.255.255.1:3000")
+
+
+class TestResolveCommand:
+    def test_caches_hits_only(self, monkeypatch):
+        monkeypatch.setattr(engine, "_RESOLVED_CMDS", {})
+        which = MagicMock(side_effect=lambda name, path=None: "/usr/bin/npx" if name == "npx" else None)
+        monkeypatch.setattr(engine.shutil, "which", which)
+        assert engine._resolve_command("npx", "/usr/bin") == "/usr/bin/npx"
+        assert engine._resolve_command("npx", "/usr/bin") == "/usr/bin/npx"
+        assert engine._resolve_command("go", "/usr/bin") is None
+        assert engine._resolve_command("go", "/usr/bin") is None
+        assert which.call_count == 3
+
+    def test_which_keys_on_current_path(self, monkeypatch):
+        monkeypatch.setattr(engine, "_RESOLVED_CMDS", {})
+        which = MagicMock(side_effect=lambda name, path=None: f"{path}/{name}")
+        monkeypatch.setattr(engine.shutil, "which", which)
+        monkeypatch.setenv("PATH", "/a")
+        assert engine._which("npx") == "/a/npx"
+        assert engine._which("npx") == "/a/npx"
+        monkeypatch.setenv("PATH", "/b")
+        assert engine._which("npx") == "/b/npx"
+        assert which.call_count == 2
+
+
+class TestReqHash:
+    def test_tracks_contents_not_mtime(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine, "_REQ_FILE_DIGESTS", {})
+        req = tmp_path / "requirements.txt"
+        req.write_text("fastapi\n")
+        before = engine._req_hash(tmp_path)
+        st = req.stat()
+        engine.os.utime(req, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert engine._req_hash(tmp_path) == before
+        req.write_text("fastapi\nhttpx\n")
+        assert engine._req_hash(tmp_path) != before
+
+    def test_rereads_only_changed_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine, "_REQ_FILE_DIGESTS", {})
+        req = tmp_path / "requirements.txt"
+        req.write_text("fastapi\n")
+        first = engine._req_hash(tmp_path)
+        read_bytes = MagicMock(side_effect=engine.Path.read_bytes)
+        monkeypatch.setattr(engine.Path, "read_bytes", lambda self: read_bytes(self))
+        assert engine._req_hash(tmp_path) == first
+        assert read_bytes.call_count == 0
+        req.write_text("fastapi\n")  # rewritten, same contents
+        assert engine._req_hash(tmp_path) == first
+        assert read_bytes.call_count == 1
+
+    def test_cached_within_ttl(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine, "_REQ_HASH_CACHE", {})
+        req_hash = MagicMock(return_value="abc")
+        monkeypatch.setattr(engine, "_req_hash", req_hash)
+        assert engine._req_hash_cached(tmp_path) == "abc"
+        assert engine._req_hash_cached(tmp_path) == "abc"
+        assert req_hash.call_count == 1
+        engine._REQ_HASH_CACHE[tmp_path] = (time.monotonic() - engine._REQ_HASH_TTL, "old")
+        assert engine._req_hash_cached(tmp_path) == "abc"
+        assert req_hash.call_count == 2
+
+
+class TestCollectTestDependencies:
+    def test_skips_heavy_duplicates_and_comments(self, tmp_path):
+        (tmp_path / "requirements.txt").write_text(
+            "# comment\nFastAPI>=0.110  # web\ntorch==2.3\n-r other.txt\n"
+            "scikit-learn\nfastapi\nzope.interface\n"
+        )
+        (tmp_path / "backend").mkdir()
+        (tmp_path / "backend" / "requirements-dev.txt").write_text("Zope-Interface\nhttpx\n")
+        assert engine._collect_test_dependencies(tmp_path) == [
+            "FastAPI>=0.110", "zope.interface", "httpx",
+        ]
+
+
+class TestFindPlaywrightConfig:
+    def test_prefers_shallowest_and_skips_vendor_dirs(self, tmp_path):
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "playwright.config.ts").write_text("")
+        deep = tmp_path / "apps" / "web" / "e2e"
+        deep.mkdir(parents=True)
+        (deep / "playwright.config.ts").write_text("")
+        assert engine._find_playwright_config(tmp_path) == deep / "playwright.config.ts"
+
+        shallow = tmp_path / "site"
+        shallow.mkdir()
+        (shallow / "playwright.config.mjs").write_text("")
+        (shallow / "playwright.config.json").write_text("")
+        assert engine._find_playwright_config(tmp_path) == shallow / "playwright.config.mjs"
+
+    def test_respects_max_depth(self, tmp_path):
+        deep = tmp_path / "a" / "b" / "c" / "d"
+        deep.mkdir(parents=True)
+        (deep / "playwright.config.js").write_text("")
+        assert engine._find_playwright_config(tmp_path) is None
+        assert engine._find_playwright_config(tmp_path, max_depth=5) == deep / "playwright.config.js"
+
+
+class TestDetectAllRunnersCache:
+    def test_reuses_detection_until_layout_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine, "_RUNNER_CACHE", {})
+        which = MagicMock(return_value=None)
+        monkeypatch.setattr(engine.shutil, "which", which)
+        (tmp_path / "backend").mkdir()
+        (tmp_path / "backend" / "conftest.py").write_text("")
+
+        first = engine._detect_all_runners(str(tmp_path))
+        calls = which.call_count
+        second = engine._detect_all_runners(str(tmp_path))
+        assert second == first and second[0]["cmd"] is not first[0]["cmd"]
+        assert which.call_count == calls
+        assert first[0]["cwd"] == str(tmp_path / "backend")
+
+        (tmp_path / "pytest.ini").write_text("[pytest]\n")
+        assert engine._detect_all_runners(str(tmp_path))[0]["cwd"] == str(tmp_path)
+
+
+
+class TestTerminateProcessGroup:
+    @staticmethod
+    async def _spawn(script: str) -> asyncio.subprocess.Process:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", script, stdout=asyncio.subprocess.PIPE, start_new_session=True,
+        )
+        await proc.stdout.readline()  # type: ignore[union-attr]
+        return proc
+
+    async def test_sigterm_is_enough_for_cooperative_process(self):
+        proc = await self._spawn("import time; print(1, flush=True); time.sleep(30)")
+        await engine._terminate_process_group(proc, grace=5)
+        assert proc.returncode == -engine.signal.SIGTERM
+
+    async def test_escalates_to_sigkill(self):
+        script = (
+            "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+            "print(1, flush=True); time.sleep(30)"
+        )
+        proc = await self._spawn(script)
+        await engine._terminate_process_group(proc, grace=0.2)
+        assert proc.returncode == -engine.signal.SIGKILL
+
+
+class TestCancelRun:
+    def test_kills_process_group(self, monkeypatch):
+        killpg = MagicMock()
+        monkeypatch.setattr(engine.os, "killpg", killpg)
+        proc = SimpleNamespace(pid=4321, returncode=None, kill=MagicMock())
+        monkeypatch.setitem(engine._running_processes, "run-1", proc)
+        assert engine.cancel_run("run-1") is True
+        killpg.assert_called_once_with(4321, engine.signal.SIGKILL)
+        proc.kill.assert_not_called()
+
+        proc.returncode = -9
+        assert engine.cancel_run("run-1") is False
+        assert engine.cancel_run("missing") is False
+
+
+class TestGetEffectivePath:
+    def test_prefers_non_empty_workspace(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(engine, "_translate_path", lambda p: f"translated:{p}")
+        assert engine._get_effective_path("p1", "/host/p1") == "translated:/host/p1"
+        ws = tmp_path / "workspace" / "p1"
+        ws.mkdir(parents=True)
+        assert engine._get_effective_path("p1", "/host/p1") == "translated:/host/p1"
+        (ws / "main.py").write_text("")
+        assert engine._get_effective_path("p1", "/host/p1") == str(engine.Path("workspace") / "p1")
+        (tmp_path / "workspace" / "p2").write_text("")
+        assert engine._get_effective_path("p2", "/host/p2") == "translated:/host/p2"
+
+
+class TestTranslatePath:
+    def test_prefix_then_basename_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine.settings, "project_path_container_prefix", str(tmp_path))
+        monkeypatch.setattr(engine.settings, "project_path_host_prefix", "/Users/me/src")
+        assert engine._translate_path("/Users/me/src/app") == f"{tmp_path}/app"
+
+        (tmp_path / "shop").mkdir()
+        assert engine._translate_path("/Volumes/other/shop") == str(tmp_path / "shop")
+        assert engine._translate_path("/Volumes/other/missing") == "/Volumes/other/missing"
+
+    def test_unstattable_path_is_treated_as_missing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(engine.settings, "project_path_container_prefix", str(tmp_path))
+        monkeypatch.setattr(engine.settings, "project_path_host_prefix", "")
+        (tmp_path / "shop").mkdir()
+        real_stat = engine.os.stat
+
+        def stat(path, *args, **kwargs):
+            if str(path).startswith("//nas/"):
+                raise OSError(112, "Host is down")
+            return real_stat(path, *args, **kwargs)
+
+        monkeypatch.setattr(engine.os, "stat", stat)
+        assert engine._translate_path("//nas/projects/shop") == str(tmp_path / "shop")
@@ -199,6 +199,14 @@ export function TestRunnerPage() {
       if (data.log) {
         addLog('info', data.log as string)
       }
+      // Test output arrives batched as { logs: [...] } — append in one update
+      if (Array.isArray(data.logs) && data.logs.length > 0) {
+        const time = new Date().toLocaleTimeString('en-US', { hour12: false })
+        const batch = (data.logs as string[]).map(
+          (message): LogEntry => ({ time, level: 'info', message })
+        )
+        setLogs((prev) => [...prev, ...batch])
+      }
 
       const status = data.status as string | undefined
       const isTerminal = status === 'passed' || status === 'failed' || status === 'cancelled'